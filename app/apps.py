@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class AppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"
+
+    def ready(self):
+        from django.conf import settings
+
+        from .registry import active_checks
+
+        # Resolve the active checks once at start up rather than on the first request
+        active_checks()
+
+        if settings.LOG_QUEUE:
+            from .logqueue import enqueue_handlers
+
+            enqueue_handlers(["", *settings.LOGGING["loggers"]])
@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict
+from typing import Optional
+
+from django.conf import settings
+
+from .clients import redis_client
+
+logger = logging.getLogger("django")
+
+_lock = threading.Lock()
+_failures: Dict[str, int] = defaultdict(int)
+_opened_at: Dict[str, float] = {}
+_trials = set()
+
+
+def threshold(check) -> int:
+    if check.breaker_threshold is not None:
+        return check.breaker_threshold
+    return settings.CHECK_BREAKER_THRESHOLD
+
+
+def cooldown(check) -> float:
+    if check.breaker_cooldown is not None:
+        return check.breaker_cooldown
+    return settings.CHECK_BREAKER_COOLDOWN
+
+
+def opened_since(check) -> Optional[float]:
+    """
+    Return the time the check's breaker opened if the check should not be run.
+
+    A closed breaker returns None. Once the cool-down has passed the breaker is half
+    open and a single trial call is let through; the others are refused until it
+    reports back.
+    """
+    if not threshold(check):
+        return None
+
+    if settings.CHECK_BREAKER_REDIS:
+        try:
+            return _opened_since_shared(check)
+        except Exception as e:
+            logger.error(f"Unable to read circuit breaker for {check.test_id}: {e}")
+
+    with _lock:
+        opened_at = _opened_at.get(check.test_id)
+        if opened_at is None:
+            return None
+        if time.time() - opened_at < cooldown(check) or check.test_id in _trials:
+            return opened_at
+        _trials.add(check.test_id)
+        return None
+
+
+def record(check, success: bool):
+    if not threshold(check):
+        return
+
+    if settings.CHECK_BREAKER_REDIS:
+        try:
+            _record_shared(check, success)
+            return
+        except Exception as e:
+            logger.error(f"Unable to update circuit breaker for {check.test_id}: {e}")
+
+    with _lock:
+        trial = check.test_id in _trials
+        _trials.discard(check.test_id)
+        if success:
+            _failures.pop(check.test_id, None)
+            _opened_at.pop(check.test_id, None)
+            return
+        _failures[check.test_id] += 1
+        if trial or _failures[check.test_id] >= threshold(check):
+            _opened_at[check.test_id] = time.time()
+
+
+def _opened_since_shared(check) -> Optional[float]:
+    r = redis_client()
+    opened_at = r.get(f"check-breaker:opened-at:{check.test_id}")
+    if opened_at is None:
+        return None
+    opened_at = float(opened_at)
+    if time.time() - opened_at < cooldown(check):
+        return opened_at
+
+    # Only one worker sends the trial call; the key expires in case it never reports
+    claimed = r.set(
+        f"check-breaker:trial:{check.test_id}",
+        1,
+        nx=True,
+        ex=max(int(check.timeout or settings.CHECK_TIMEOUT), 1),
+    )
+    return None if claimed else opened_at
+
+
+def _record_shared(check, success: bool):
+    r = redis_client()
+    keys = [
+        f"check-breaker:failures:{check.test_id}",
+        f"check-breaker:opened-at:{check.test_id}",
+        f"check-breaker:trial:{check.test_id}",
+    ]
+    if success:
+        r.delete(*keys)
+        return
+
+    pipeline = r.pipeline(transaction=False)
+    pipeline.incr(keys[0])
+    pipeline.get(keys[2])
+    failures, trial = pipeline.execute()
+    if trial is not None or failures >= threshold(check):
+        pipeline.set(keys[1], time.time())
+        pipeline.delete(keys[2])
+        pipeline.execute()
+
+
+def reset():
+    with _lock:
+        _failures.clear()
+        _opened_at.clear()
+        _trials.clear()
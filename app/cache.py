@@ -0,0 +1,188 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import orjson
+from django.conf import settings
+from django.db import connections
+
+from .clients import redis_client
+from .singleflight import singleflight
+from .util import Check
+from .util import CheckResult
+from .util import dumps
+from .util import results_from_json
+from .util import run_blocking
+
+logger = logging.getLogger("django")
+
+Entry = Tuple[float, List[CheckResult]]
+
+
+class CheckResultCache:
+    """
+    Caches check results by test_id.
+
+    Results younger than the check's TTL are served as they are. Older results are
+    still served for CHECK_CACHE_STALE_TTL seconds while a single background refresh
+    runs. Misses go through the singleflight layer, so concurrent callers share one
+    run of the check. Entries live in an in-process LRU and, with CHECK_CACHE_REDIS
+    set, in Redis so that every worker can reuse the same probe.
+    """
+
+    def __init__(self, maxsize: int = None):
+        self.maxsize = maxsize or settings.CHECK_CACHE_SIZE
+        self._entries: "OrderedDict[str, Entry]" = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def ttl(self, check: Check) -> float:
+        if check.test_id in settings.CHECK_CACHE_TTLS:
+            return settings.CHECK_CACHE_TTLS[check.test_id]
+        if check.cache_ttl is not None:
+            return check.cache_ttl
+        return settings.CHECK_CACHE_TTL
+
+    def call(self, check: Check) -> List[CheckResult]:
+        if not self.ttl(check):
+            return singleflight.call(check)
+
+        cached = self.lookup(check)
+        if cached is not None:
+            return cached
+
+        return self.store(check, singleflight.call(check))
+
+    async def run(self, check: Check) -> List[CheckResult]:
+        if not self.ttl(check):
+            return await singleflight.run(check)
+
+        # The shared tier reads and writes Redis, which must not block the event loop
+        shared = settings.CHECK_CACHE_REDIS
+        cached = await run_blocking(shared, self.lookup, check)
+        if cached is not None:
+            return cached
+
+        results = await singleflight.run(check)
+        return await run_blocking(shared, self.store, check, results)
+
+    def lookup(self, check: Check) -> Optional[List[CheckResult]]:
+        ttl = self.ttl(check)
+        entry = self._get_local(check.test_id)
+        if entry is None or self._age(entry) >= ttl:
+            entry = self._get_shared(check.test_id) or entry
+        if entry is None:
+            return None
+
+        age = self._age(entry)
+        if age >= ttl + settings.CHECK_CACHE_STALE_TTL:
+            return None
+        if age >= ttl:
+            self._refresh_in_background(check)
+
+        return [result.with_cache_age(round(age, 3)) for result in entry[1]]
+
+    def store(self, check: Check, results: List[CheckResult]) -> List[CheckResult]:
+        entry = (time.time(), results)
+        self._set_local(check.test_id, entry)
+        self._set_shared(check, entry)
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _age(self, entry: Entry) -> float:
+        return max(time.time() - entry[0], 0)
+
+    def _get_local(self, test_id: str) -> Optional[Entry]:
+        with self._lock:
+            entry = self._entries.get(test_id)
+            if entry is not None:
+                self._entries.move_to_end(test_id)
+            return entry
+
+    def _set_local(self, test_id: str, entry: Entry):
+        with self._lock:
+            self._entries[test_id] = entry
+            self._entries.move_to_end(test_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _get_shared(self, test_id: str) -> Optional[Entry]:
+        if not settings.CHECK_CACHE_REDIS:
+            return None
+        try:
+            cached = redis_client().get(f"check-cache:{test_id}")
+            if cached is None:
+                return None
+            data = orjson.loads(cached)
+            entry = (data["stored_at"], results_from_json(data["results"]))
+            self._set_local(test_id, entry)
+            return entry
+        except Exception as e:
+            logger.error(f"Unable to read cached results for {test_id}: {e}")
+            return None
+
+    def _set_shared(self, check: Check, entry: Entry):
+        if not settings.CHECK_CACHE_REDIS:
+            return
+        stored_at, results = entry
+        try:
+            redis_client().set(
+                f"check-cache:{check.test_id}",
+                dumps({"stored_at": stored_at, "results": results}),
+                ex=max(int(self.ttl(check) + settings.CHECK_CACHE_STALE_TTL), 1),
+            )
+        except Exception as e:
+            logger.error(f"Unable to cache results for {check.test_id}: {e}")
+
+    def _claim_refresh(self, check: Check) -> bool:
+        with self._lock:
+            if check.test_id in self._refreshing:
+                return False
+            self._refreshing.add(check.test_id)
+
+        if not settings.CHECK_CACHE_REDIS:
+            return True
+        try:
+            # Only one worker refreshes a stale entry; the others keep serving it
+            claimed = redis_client().set(
+                f"check-cache-refresh:{check.test_id}",
+                1,
+                nx=True,
+                ex=max(int(settings.CHECK_TIMEOUT), 1),
+            )
+        except Exception:
+            claimed = True
+        if not claimed:
+            self._release_refresh(check)
+        return bool(claimed)
+
+    def _release_refresh(self, check: Check):
+        with self._lock:
+            self._refreshing.discard(check.test_id)
+
+    def _refresh_in_background(self, check: Check):
+        if not self._claim_refresh(check):
+            return
+
+        def refresh():
+            try:
+                self.store(check, check())
+            except Exception as e:
+                logger.error(f"Unable to refresh {check.description}: {e}")
+            finally:
+                self._release_refresh(check)
+                connections.close_all()
+
+        threading.Thread(
+            target=refresh, name=f"refresh-{check.test_id}", daemon=True
+        ).start()
+
+
+check_cache = CheckResultCache()
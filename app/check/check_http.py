@@ -1,13 +1,26 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import TYPE_CHECKING
 from typing import List
 from typing import Union
 from urllib.parse import ParseResult
 from urllib.parse import urlparse
 
+# Unlike the other client libraries requests is not deferred: app.views imports it
+# for the web and API connectivity views, so it is loaded with the views regardless
 import requests
 
 from app.check.check import Check
 from app.check.report import CheckReport
 
+if TYPE_CHECKING:
+    import aiohttp
+
+
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 5
+
 
 class HTTPCheckInstance:
     definition: str
@@ -15,13 +28,22 @@ class HTTPCheckInstance:
     url: ParseResult
     status_code: int
     report: CheckReport
-
-    def __init__(self, definition: str):
+    connect_timeout: float
+    read_timeout: float
+
+    def __init__(
+        self,
+        definition: str,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+    ):
         self.definition = definition
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
         self.report = CheckReport()
         self.report.summary = definition
 
-    def execute(self):
+    def _prepare(self) -> bool:
         segments = self.definition.split("|")
 
         self.status_code = 200
@@ -39,7 +61,7 @@ class HTTPCheckInstance:
             self.report.errors.append(
                 f"expected status code to be integer, got {segments[1]}"
             )
-            return
+            return False
 
         try:
             method = segments[2]
@@ -47,41 +69,111 @@ class HTTPCheckInstance:
         except IndexError:
             pass
 
-        requester = getattr(requests, self.method, None)
-
-        if not requester:
+        if not getattr(requests, self.method, None):
             self.report.success = False
             self.report.errors.append(
                 f'method "{self.method.upper()}" is not a valid HTTP method'
             )
+            return False
+
+        return True
+
+    def _verify(self, status_code: int):
+        if status_code != self.status_code:
+            self.report.success = False
+            self.report.errors.append(
+                f"expected HTTP Status {self.status_code} but got {status_code}"
+            )
+
+    def _fail(self, error: Exception):
+        self.report.success = False
+        if isinstance(error, ValueError):
+            self.report.errors.append(f'"{self.url.geturl()}" is not a valid URL')
+        else:
+            self.report.errors.append(str(error))
+
+    def execute(self, session: requests.Session = None):
+        if not self._prepare():
             return
 
+        requester = getattr(session or requests, self.method)
+
+        start = monotonic()
         try:
-            r = requester(self.url.geturl())
+            r = requester(
+                self.url.geturl(), timeout=(self.connect_timeout, self.read_timeout)
+            )
+            self._verify(r.status_code)
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self.report.elapsed = monotonic() - start
 
-            if r.status_code != self.status_code:
-                self.report.success = False
-                self.report.errors.append(
-                    f"expected HTTP Status {self.status_code} but got {r.status_code}"
-                )
+    async def execute_async(self, session: "aiohttp.ClientSession"):
+        import aiohttp
 
-        except ValueError:
-            self.report.success = False
-            self.report.errors.append(f'"{self.url.geturl()}" is not a valid URL')
+        if not self._prepare():
+            return
+
+        timeout = aiohttp.ClientTimeout(
+            sock_connect=self.connect_timeout, sock_read=self.read_timeout
+        )
+
+        start = monotonic()
+        try:
+            async with session.request(
+                self.method.upper(), self.url.geturl(), timeout=timeout
+            ) as r:
+                self._verify(r.status)
         except Exception as e:
-            self.report.success = False
-            self.report.errors.append(str(e))
+            self._fail(e)
+        finally:
+            self.report.elapsed = monotonic() - start
 
 
 class HTTPCheck(Check):
     checks: List[HTTPCheckInstance]
 
-    def __init__(self, definition: str):
-        self.checks = [HTTPCheckInstance(d) for d in definition.split(",")]
+    def __init__(
+        self,
+        definition: str,
+        session: requests.Session = None,
+        max_workers: int = 4,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+    ):
+        self.checks = [
+            HTTPCheckInstance(d, connect_timeout, read_timeout)
+            for d in definition.split(",")
+        ]
+        self.session = session
+        self.max_workers = max_workers
 
     def execute(self):
-        for check in self.checks:
-            check.execute()
+        if len(self.checks) == 1:
+            self.checks[0].execute(self.session)
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(self.checks))
+        ) as executor:
+            list(executor.map(lambda c: c.execute(self.session), self.checks))
+
+    async def execute_async(self, session: "aiohttp.ClientSession" = None):
+        import aiohttp
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def execute(check, session):
+            async with semaphore:
+                await check.execute_async(session)
+
+        if session is not None:
+            await asyncio.gather(*[execute(c, session) for c in self.checks])
+            return
+
+        async with aiohttp.ClientSession() as session:
+            await asyncio.gather(*[execute(c, session) for c in self.checks])
 
     @property
     def success(self) -> bool:
@@ -1,25 +1,56 @@
+from dataclasses import dataclass
+from dataclasses import field
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
 from typing import List
+from typing import Optional
 
 import jinja2
+from django.conf import settings
 
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "views"
 
-class CheckReport:
-    success: bool
-    summary: str
-    errors: List[str]
 
-    def __init__(
-        self, success: bool = True, summary: str = "", errors: List[str] = None
-    ) -> None:
-        self.success = success
-        self.summary = summary
-        self.errors = errors if errors else []
+@lru_cache(maxsize=None)
+def _environment() -> jinja2.Environment:
+    bytecode_cache_dir = settings.JINJA_BYTECODE_CACHE_DIR
+
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
+        keep_trailing_newline=True,
+        # Templates only change on deploy, so skip the per-render filesystem stat
+        auto_reload=False,
+        bytecode_cache=(
+            jinja2.FileSystemBytecodeCache(bytecode_cache_dir)
+            if bytecode_cache_dir
+            else None
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def _template(name: str) -> jinja2.Template:
+    return _environment().get_template(name)
+
+
+@lru_cache(maxsize=None)
+def _many_template() -> jinja2.Template:
+    return _environment().from_string(
+        '{% for report in reports %}{% include "report.html" %}{% endfor %}'
+    )
+
+
+@dataclass(slots=True)
+class CheckReport:
+    success: bool = True
+    summary: str = ""
+    errors: List[str] = field(default_factory=list)
+    elapsed: Optional[float] = None
 
     def render(self) -> str:
-        env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader("app/views"), keep_trailing_newline=True
-        )
+        return _template("report.html").render({"report": self})
 
-        report_template = env.get_template("report.html")
 
-        return report_template.render({"report": self})
+def render_many(reports: Iterable[CheckReport]) -> str:
+    return _many_template().render({"reports": reports})
@@ -1,34 +1,91 @@
-import json
+import codecs
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from time import monotonic
 
-import boto3
-import redis
-import requests
-from bs4 import BeautifulSoup
+from celery.exceptions import TimeoutError as CeleryTimeoutError
 from django.conf import settings
 from django.db import connections
-from opensearchpy import OpenSearch
-from tenacity import RetryError
-from tenacity import retry
-from tenacity import stop_after_delay
-from tenacity import wait_fixed
 
 from celery_worker.tasks import demodjango_task
 
 from .check.check_http import HTTPCheck
+from .check.report import render_many
+from .clients import aiohttp_session
+from .clients import async_opensearch_client
+from .clients import async_redis_client
+from .clients import http_session
+from .clients import opensearch_client
+from .clients import redis_client
+from .clients import s3_client
+from .registry import register
 from .util import Check
 from .util import CheckResult
 
+logger = logging.getLogger("django")
 
-def read_from_bucket(bucket_name):
-    s3 = boto3.resource("s3")
-    bucket = s3.Bucket(bucket_name)
-    body = bucket.Object("sample_file.txt")
-    return f'{body.get()["Body"].read().decode()}Bucket: {bucket_name}'
+# Backend client libraries are imported inside the checks that use them, so a
+# worker only pays for the ones its active checks need
 
+_bucket_reads = {}
 
+
+def read_from_bucket(bucket_name, max_bytes=None):
+    from botocore.exceptions import ClientError
+
+    max_bytes = max_bytes or settings.S3_READ_MAX_BYTES
+    request = {
+        "Bucket": bucket_name,
+        "Key": "sample_file.txt",
+        "Range": f"bytes=0-{max_bytes - 1}",
+    }
+
+    cached = _bucket_reads.get((bucket_name, max_bytes))
+    if settings.S3_CONDITIONAL_READS and cached:
+        request["IfNoneMatch"] = cached[0]
+
+    try:
+        response = s3_client().get_object(**request)
+    except ClientError as e:
+        if "IfNoneMatch" in request and e.response["Error"]["Code"] in (
+            "304",
+            "NotModified",
+        ):
+            return f"{cached[1]}Bucket: {bucket_name}"
+        raise
+
+    content = decode_body(response["Body"], max_bytes)
+    if settings.S3_CONDITIONAL_READS and "ETag" in response:
+        _bucket_reads[(bucket_name, max_bytes)] = (response["ETag"], content)
+
+    return f"{content}Bucket: {bucket_name}"
+
+
+def decode_body(body, max_bytes):
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    content, remaining = [], max_bytes
+    try:
+        # Stop at max_bytes even if the Range header was ignored
+        for chunk in body.iter_chunks(chunk_size=min(max_bytes, 8192)):
+            content.append(decoder.decode(chunk[:remaining]))
+            remaining -= len(chunk)
+            if remaining <= 0:
+                break
+        content.append(decoder.decode(b"", final=True))
+    finally:
+        body.close()
+    return "".join(content)
+
+
+@register
 class PostgresRdsCheck(Check):
+    order = 6
+    critical = True
+    tags = ("database",)
+    concurrency_group = "database"
+
     def __init__(self):
         super().__init__("postgres_rds", "PostgreSQL (RDS)")
 
@@ -44,35 +101,37 @@ class PostgresRdsCheck(Check):
             return [self.result(False, str(e))]
 
 
+@register
 class CeleryWorkerCheck(Check):
-    def __init__(self, logger):
+    order = 3
+    tags = ("celery",)
+    # Run from the snapshot task, this would wait on a task queued behind itself in
+    # the same worker pool
+    snapshot = False
+
+    def __init__(self, logger=logger):
         super().__init__("celery", "Celery Worker", logger=logger)
 
     def __call__(self):
-        from demodjango import celery_app
-
         get_result_timeout = 2
-
-        @retry(stop=stop_after_delay(get_result_timeout), wait=wait_fixed(1))
-        def get_result_from_celery_backend():
-            self.logger.info("Getting result from Celery backend")
-            backend_result = json.loads(
-                celery_app.backend.get(f"celery-task-meta-{task_id}")
-            )
-            self.logger.debug("backend_result")
-            self.logger.debug(backend_result)
-            if backend_result["status"] != "SUCCESS":
-                raise Exception
-            return backend_result
+        task_id = None
 
         try:
             timestamp = datetime.utcnow()
             self.logger.info("Adding debug task to Celery queue")
-            task_id = str(demodjango_task.delay(f"{timestamp}"))
-            backend_result = get_result_from_celery_backend()
-            connection_info = f"{backend_result['result']} with task_id {task_id} was processed at {backend_result['date_done']} with status {backend_result['status']}"
+            enqueued_at = monotonic()
+            async_result = demodjango_task.delay(f"{timestamp}")
+            task_id = async_result.id
+            # The Redis result backend subscribes to the task's result channel, so this
+            # wakes as soon as the worker publishes it rather than polling
+            result = async_result.get(timeout=get_result_timeout)
+            latency = monotonic() - enqueued_at
+            self.logger.info(
+                {"check": self.test_id, "task_id": task_id, "latency": latency}
+            )
+            connection_info = f"{result} with task_id {task_id} was processed at {async_result.date_done} with status {async_result.status} in {latency * 1000:.0f} ms"
             return [self.result(True, connection_info)]
-        except RetryError:
+        except CeleryTimeoutError:
             connection_info = f"task_id {task_id} was not processed within {get_result_timeout} seconds"
             self.logger.error(connection_info)
             return [self.result(False, connection_info)]
@@ -81,45 +140,67 @@ class CeleryWorkerCheck(Check):
             return [self.result(False, str(e))]
 
 
+@register
 class CeleryBeatCheck(Check):
+    order = 2
+    tags = ("celery", "database")
+    concurrency_group = "database"
+
     def __init__(self):
         super().__init__("beat", "Celery Beat")
 
     def __call__(self):
+        from .heartbeats import latest_heartbeat
         from .models import ScheduledTask
 
         try:
+            if settings.HEARTBEAT_BUFFERING:
+                heartbeat = latest_heartbeat()
+                if heartbeat:
+                    connection_info = f"Latest task scheduled with task_id {heartbeat['taskid']} at {heartbeat['timestamp']}"
+                    return [self.result(True, connection_info)]
+
             if not os.environ.get("RDS_POSTGRES_CREDENTIALS"):
                 raise Exception("Database not found")
 
-            latest_task = ScheduledTask.objects.all().order_by("-timestamp").first()
+            latest_task = ScheduledTask.objects.latest()
             connection_info = f"Latest task scheduled with task_id {latest_task.taskid} at {latest_task.timestamp}"
             return [self.result(True, connection_info)]
         except Exception as e:
             return [self.result(False, str(e))]
 
 
+@register
 class RedisCheck(Check):
+    order = 9
+    critical = True
+    tags = ("cache",)
+
     def __init__(self):
         super().__init__("redis", "Redis")
 
     def __call__(self):
         try:
-            r = redis.Redis.from_url(f"{settings.REDIS_ENDPOINT}")
+            r = redis_client()
             return [self.result(True, r.get("test-data").decode())]
         except Exception as e:
             return [self.result(False, str(e))]
 
-
-class ServerTimeCheck(Check):
-    def __init__(self):
-        super().__init__("server_time", "Server Time")
-
-    def __call__(self):
-        return [self.result(True, str(datetime.utcnow()))]
+    async def run(self):
+        try:
+            value = await async_redis_client().get("test-data")
+            return [self.result(True, value.decode())]
+        except Exception as e:
+            return [self.result(False, str(e))]
 
 
+@register
 class GitInformationCheck(Check):
+    order = 0
+    mandatory = True
+    tags = ("local",)
+    breaker_threshold = 0
+
     def __init__(self):
         super().__init__("git_information", "Git information")
 
@@ -136,25 +217,69 @@ class GitInformationCheck(Check):
         ]
 
 
+@register
+class ServerTimeCheck(Check):
+    order = 1
+    cache_ttl = 0
+    mandatory = True
+    tags = ("local",)
+    breaker_threshold = 0
+
+    def __init__(self):
+        super().__init__("server_time", "Server Time")
+
+    def __call__(self):
+        return [self.result(True, str(datetime.utcnow()))]
+
+
+@register
 class HttpConnectionCheck(Check):
+    order = 4
+    tags = ("network",)
+
     def __init__(self):
         super().__init__("http", "HTTP Checks")
 
+    def http_check_options(self):
+        return {
+            "max_workers": settings.HTTP_CHECK_MAX_WORKERS,
+            "connect_timeout": settings.HTTP_CHECK_CONNECT_TIMEOUT,
+            "read_timeout": settings.HTTP_CHECK_READ_TIMEOUT,
+        }
+
     def __call__(self):
         urls = os.environ.get("HTTP_CHECK_URLS", "https://httpstat.us/200|200|GET")
 
-        check = HTTPCheck(urls)
+        check = HTTPCheck(urls, session=http_session(), **self.http_check_options())
         check.execute()
 
         return [
             self.result(
                 check.success,
-                "".join([c.render() for c in check.report]),
+                render_many(check.report),
+            )
+        ]
+
+    async def run(self):
+        urls = os.environ.get("HTTP_CHECK_URLS", "https://httpstat.us/200|200|GET")
+
+        check = HTTPCheck(urls, **self.http_check_options())
+        await check.execute_async(aiohttp_session())
+
+        return [
+            self.result(
+                check.success,
+                render_many(check.report),
             )
         ]
 
 
+@register
 class PrivateSubmoduleCheck(Check):
+    order = 7
+    tags = ("local",)
+    breaker_threshold = 0
+
     def __init__(self):
         super().__init__("private_submodule", "Private submodule")
 
@@ -175,7 +300,13 @@ class PrivateSubmoduleCheck(Check):
         return [self.result(success, connection_info)]
 
 
+@register
 class ReadWriteCheck(Check):
+    order = 8
+    critical = True
+    tags = ("local",)
+    breaker_threshold = 0
+
     def __init__(self):
         super().__init__("read_write", "Filesystem read/write")
 
@@ -207,7 +338,11 @@ class ReadWriteCheck(Check):
             return [self.result(False, str(e))]
 
 
+@register
 class S3AdditionalBucketCheck(Check):
+    order = 11
+    tags = ("storage", "s3")
+
     def __init__(self):
         super().__init__("s3_additional", "S3 Additional Bucket")
 
@@ -219,26 +354,49 @@ class S3AdditionalBucketCheck(Check):
             return [self.result(False, str(e))]
 
 
+@register
 class S3StaticBucketCheck(Check):
+    order = 12
+    tags = ("storage", "s3")
+
     def __init__(self):
         super().__init__("s3_static", "S3 Bucket for static assets")
 
     def __call__(self):
         try:
-            response = requests.get(f"https://{settings.STATIC_S3_ENDPOINT}/test.html")
-            if response.status_code == 200:
-                parsed_html = BeautifulSoup(response.text, "html.parser")
-                test_text = parsed_html.body.find("p").text
-                return [self.result(True, test_text)]
-
-            raise Exception(
-                f"Failed to get static asset with status code: {response.status_code}"
+            response = http_session().get(
+                f"https://{settings.STATIC_S3_ENDPOINT}/test.html"
             )
+            return [self.parse_test_page(response.status_code, response.text)]
         except Exception as e:
             return [self.result(False, str(e))]
 
+    async def run(self):
+        try:
+            async with aiohttp_session().get(
+                f"https://{settings.STATIC_S3_ENDPOINT}/test.html"
+            ) as response:
+                text = await response.text()
+                return [self.parse_test_page(response.status, text)]
+        except Exception as e:
+            return [self.result(False, str(e))]
+
+    def parse_test_page(self, status_code, text):
+        from bs4 import BeautifulSoup
+
+        if status_code == 200:
+            parsed_html = BeautifulSoup(text, "html.parser")
+            test_text = parsed_html.body.find("p").text
+            return self.result(True, test_text)
+
+        raise Exception(f"Failed to get static asset with status code: {status_code}")
+
 
+@register
 class S3BucketCheck(Check):
+    order = 10
+    tags = ("storage", "s3")
+
     def __init__(self):
         super().__init__("s3", "S3 Bucket")
 
@@ -250,7 +408,11 @@ class S3BucketCheck(Check):
             return [self.result(False, str(e))]
 
 
+@register
 class S3CrossEnvironmentBucketChecks(Check):
+    order = 13
+    tags = ("storage", "s3")
+
     def __init__(self):
         super().__init__("s3_cross_environment", "Cross environment S3 Buckets")
 
@@ -260,7 +422,6 @@ class S3CrossEnvironmentBucketChecks(Check):
             for bucket in settings.S3_CROSS_ENVIRONMENT_BUCKET_NAMES.split(",")
             if bucket.strip()
         ]
-        check_results = []
         if not buckets:
             return [
                 CheckResult(
@@ -270,38 +431,49 @@ class S3CrossEnvironmentBucketChecks(Check):
                     "No cross-environment buckets configured",
                 )
             ]
-        for bucket in buckets:
-            try:
-                result = read_from_bucket(bucket)
-                check_results.append(
-                    CheckResult(
-                        self.test_id, f"{self.description} ({bucket})", True, result
-                    )
-                )
-            except Exception as e:
-                check_results.append(
-                    CheckResult(
-                        self.test_id,
-                        f"{self.description} ({bucket})",
-                        False,
-                        f"Error reading {bucket}: {str(e)}",
-                    )
-                )
-        return check_results
 
+        # Each probe is bounded by the S3 client's connect and read timeouts
+        with ThreadPoolExecutor(
+            max_workers=min(settings.S3_CROSS_ENVIRONMENT_MAX_WORKERS, len(buckets))
+        ) as executor:
+            return list(executor.map(self.probe, buckets))
 
+    def probe(self, bucket):
+        try:
+            result = read_from_bucket(
+                bucket, max_bytes=settings.S3_CROSS_ENVIRONMENT_PROBE_BYTES
+            )
+            return CheckResult(
+                self.test_id, f"{self.description} ({bucket})", True, result
+            )
+        except Exception as e:
+            return CheckResult(
+                self.test_id,
+                f"{self.description} ({bucket})",
+                False,
+                f"Error reading {bucket}: {str(e)}",
+            )
+
+
+@register
 class OpensearchCheck(Check):
-    def __init__(self, logger):
+    order = 5
+    tags = ("search",)
+
+    def __init__(self, logger=logger):
         super().__init__("opensearch", "OpenSearch", logger=logger)
 
     def __call__(self):
+        from tenacity import RetryError
+        from tenacity import retry
+        from tenacity import stop_after_delay
+        from tenacity import wait_fixed
+
         get_result_timeout = 5
 
         @retry(stop=stop_after_delay(get_result_timeout), wait=wait_fixed(1))
         def read_content_from_opensearch():
-            opensearch_client = OpenSearch(f"{settings.OPENSEARCH_ENDPOINT}")
-            results = opensearch_client.get(index="test-index", id=1)
-            return results
+            return opensearch_client().get(index="test-index", id=1)
 
         try:
             results = read_content_from_opensearch()
@@ -312,3 +484,25 @@ class OpensearchCheck(Check):
             return [self.result(False, connection_info)]
         except Exception as e:
             return [self.result(False, str(e))]
+
+    async def run(self):
+        from tenacity import RetryError
+        from tenacity import retry
+        from tenacity import stop_after_delay
+        from tenacity import wait_fixed
+
+        get_result_timeout = 5
+
+        @retry(stop=stop_after_delay(get_result_timeout), wait=wait_fixed(1))
+        async def read_content_from_opensearch():
+            return await async_opensearch_client().get(index="test-index", id=1)
+
+        try:
+            results = await read_content_from_opensearch()
+            return [self.result(True, results["_source"]["text"])]
+        except RetryError:
+            connection_info = f"Unable to read content from {self.description} within {get_result_timeout} seconds"
+            self.logger.error(connection_info)
+            return [self.result(False, connection_info)]
+        except Exception as e:
+            return [self.result(False, str(e))]
@@ -0,0 +1,164 @@
+import asyncio
+import os
+import threading
+import weakref
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+
+if TYPE_CHECKING:
+    import aiohttp
+    import boto3
+    import redis
+    import redis.asyncio
+    import requests
+    from opensearchpy import AsyncOpenSearch
+    from opensearchpy import OpenSearch
+
+# The client libraries are imported when a client is first created, so that a
+# worker only loads the ones for the backends it actually talks to
+_clients = {}
+# Async clients are bound to the event loop they were created on, so they are kept
+# per loop and dropped along with it
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.RLock()
+
+
+def _get_or_create(key, factory):
+    with _lock:
+        if key not in _clients:
+            _clients[key] = factory()
+        return _clients[key]
+
+
+def _get_or_create_for_loop(key, factory):
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _loop_clients.setdefault(loop, {})
+        if key not in clients:
+            clients[key] = factory()
+        return clients[key]
+
+
+def reset():
+    with _lock:
+        _clients.clear()
+        _loop_clients.clear()
+
+
+def _reset_after_fork():
+    # Sockets must not be shared with the parent after gunicorn forks a worker, and
+    # the lock may have been held by another thread at the time of the fork
+    global _lock
+    _lock = threading.RLock()
+    _clients.clear()
+    _loop_clients.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def redis_client() -> "redis.Redis":
+    def create():
+        import redis
+
+        return redis.Redis.from_url(
+            url,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            socket_timeout=settings.REDIS_TIMEOUT,
+        )
+
+    url = f"{settings.REDIS_ENDPOINT}"
+    return _get_or_create(("redis", url), create)
+
+
+def boto3_session() -> "boto3.session.Session":
+    def create():
+        import boto3
+
+        return boto3.session.Session()
+
+    return _get_or_create("boto3", create)
+
+
+def s3_client():
+    def create():
+        from botocore.config import Config
+
+        config = Config(
+            connect_timeout=settings.S3_TIMEOUT,
+            read_timeout=settings.S3_TIMEOUT,
+            max_pool_connections=max(settings.S3_CROSS_ENVIRONMENT_MAX_WORKERS, 10),
+            # Retrying a timed out request would take a bucket that does not answer
+            # well past CHECK_TIMEOUT, losing the results of the other buckets
+            retries={"total_max_attempts": 1},
+        )
+        return boto3_session().client("s3", config=config)
+
+    return _get_or_create("s3", create)
+
+
+def opensearch_client() -> "OpenSearch":
+    def create():
+        from opensearchpy import OpenSearch
+
+        return OpenSearch(url)
+
+    url = f"{settings.OPENSEARCH_ENDPOINT}"
+    return _get_or_create(("opensearch", url), create)
+
+
+def http_session() -> "requests.Session":
+    def create():
+        from http.cookiejar import DefaultCookiePolicy
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        # Probes must not send each other's cookies
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_maxsize=settings.CHECK_MAX_WORKERS)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    return _get_or_create("http", create)
+
+
+def async_redis_client() -> "redis.asyncio.Redis":
+    def create():
+        import redis.asyncio
+
+        return redis.asyncio.Redis.from_url(
+            url,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            socket_timeout=settings.REDIS_TIMEOUT,
+        )
+
+    url = f"{settings.REDIS_ENDPOINT}"
+    return _get_or_create_for_loop(("redis", url), create)
+
+
+def async_opensearch_client() -> "AsyncOpenSearch":
+    def create():
+        from opensearchpy import AsyncOpenSearch
+
+        return AsyncOpenSearch(url)
+
+    url = f"{settings.OPENSEARCH_ENDPOINT}"
+    return _get_or_create_for_loop(("opensearch", url), create)
+
+
+def aiohttp_session() -> "aiohttp.ClientSession":
+    def create():
+        import aiohttp
+
+        return aiohttp.ClientSession(
+            cookie_jar=aiohttp.DummyCookieJar(),
+            connector=aiohttp.TCPConnector(limit=settings.CHECK_MAX_WORKERS),
+        )
+
+    return _get_or_create_for_loop("http", create)
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from contextlib import nullcontext
+from time import monotonic
+from typing import AsyncIterator
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from django.conf import settings
+from django.db import connections
+
+from .cache import check_cache
+from .util import Check
+from .util import CheckResult
+
+logger = logging.getLogger("django")
+
+# One pool per process bounds the threads running checks however many pages are
+# being served at once
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.CHECK_MAX_WORKERS, thread_name_prefix="check"
+            )
+        return _executor
+
+
+def _reset_after_fork():
+    # The pool's threads do not survive gunicorn forking a worker, and the lock may
+    # have been held by another thread at the time of the fork
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _run_check(
+    check: Check, index: int, started_at: dict, use_cache: bool, group_lock
+) -> List[CheckResult]:
+    with group_lock:
+        started_at[index] = monotonic()
+        try:
+            return check_cache.call(check) if use_cache else check()
+        except Exception as e:
+            logger.error(e)
+            return [check.result(False, str(e))]
+        finally:
+            # Pool threads are outside the request cycle, so Django never closes
+            # their DB connections itself
+            connections.close_all()
+
+
+def _group_locks(checks: List[Check], lock_type) -> dict:
+    return {
+        check.concurrency_group: lock_type()
+        for check in checks
+        if check.concurrency_group
+    }
+
+
+def iter_checks(
+    checks: List[Check],
+    check_timeout: float = None,
+    page_timeout: float = None,
+    max_workers: int = None,
+    use_cache: bool = True,
+) -> Iterator[Tuple[int, List[CheckResult]]]:
+    """
+    Run checks concurrently, yielding each check's position and results as it finishes.
+
+    A check that has not finished within its timeout (check_timeout unless the check
+    sets its own) of starting, or by the time page_timeout has elapsed, is reported as
+    a failed result instead of being waited on. Checks sharing a concurrency group run
+    one after another. At most max_workers of the checks are handed to the shared pool
+    at a time.
+    """
+    check_timeout = check_timeout or settings.CHECK_TIMEOUT
+    page_timeout = page_timeout or settings.CHECKS_PAGE_TIMEOUT
+    max_workers = max_workers or settings.CHECK_MAX_WORKERS
+
+    if not checks:
+        return
+
+    page_deadline = monotonic() + page_timeout
+    started_at = {}
+    locks = _group_locks(checks, threading.Lock)
+    queued = list(range(len(checks)))
+    positions = {}
+    pending = set()
+
+    def submit_next():
+        index = queued.pop(0)
+        check = checks[index]
+        future = _get_executor().submit(
+            _run_check,
+            check,
+            index,
+            started_at,
+            use_cache,
+            locks.get(check.concurrency_group) or nullcontext(),
+        )
+        positions[future] = index
+        pending.add(future)
+
+    def timeout_for(index):
+        return checks[index].timeout or check_timeout
+
+    def deadline(index, now):
+        # Checks still queued behind max_workers, the pool or their concurrency group
+        # get their full allowance once started
+        check_deadline = started_at.get(index, now) + timeout_for(index)
+        return min(check_deadline, page_deadline)
+
+    def timed_out(index, now):
+        check = checks[index]
+        timeout = (
+            timeout_for(index) if deadline(index, now) < page_deadline else page_timeout
+        )
+        logger.error(f"{check.description} timed out")
+        return index, [check.timed_out_result(timeout)]
+
+    try:
+        while queued and len(pending) < max_workers:
+            submit_next()
+        while pending or queued:
+            now = monotonic()
+            expired = [
+                f
+                for f in pending
+                if not f.done() and deadline(positions[f], now) <= now
+            ]
+            for future in sorted(expired, key=positions.get):
+                # A check that has started cannot be cancelled and finishes in the
+                # background, but no longer counts towards max_workers
+                future.cancel()
+                pending.discard(future)
+                yield timed_out(positions[future], now)
+            if now >= page_deadline:
+                while queued:
+                    yield timed_out(queued.pop(0), now)
+            while queued and len(pending) < max_workers:
+                submit_next()
+            if pending:
+                next_deadline = min(deadline(positions[f], now) for f in pending)
+                done, _ = wait(
+                    pending, timeout=next_deadline - now, return_when=FIRST_COMPLETED
+                )
+                for future in sorted(done, key=positions.get):
+                    pending.discard(future)
+                    yield positions[future], future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def run_checks(checks: List[Check], **kwargs) -> List[CheckResult]:
+    """
+    Run checks concurrently, returning their results in the order the checks were given.
+    """
+    results = dict(iter_checks(checks, **kwargs))
+    return [result for index in sorted(results) for result in results[index]]
+
+
+async def iter_checks_async(
+    checks: List[Check], check_timeout: float = None, page_timeout: float = None
+) -> AsyncIterator[Tuple[int, List[CheckResult]]]:
+    """
+    Await every check's run() together, yielding each check's position and results as
+    it finishes.
+    """
+    check_timeout = check_timeout or settings.CHECK_TIMEOUT
+    page_timeout = page_timeout or settings.CHECKS_PAGE_TIMEOUT
+    page_deadline = monotonic() + page_timeout
+    locks = _group_locks(checks, asyncio.Lock)
+
+    async def run(index, check):
+        async with locks.get(check.concurrency_group) or nullcontext():
+            timeout = check.timeout or check_timeout
+            remaining = page_deadline - monotonic()
+            if remaining < timeout:
+                timeout = page_timeout
+            try:
+                return index, await asyncio.wait_for(
+                    check_cache.run(check), min(timeout, remaining)
+                )
+            except asyncio.TimeoutError:
+                logger.error(f"{check.description} timed out")
+                return index, [check.timed_out_result(timeout)]
+            except Exception as e:
+                logger.error(e)
+                return index, [check.result(False, str(e))]
+
+    tasks = [asyncio.ensure_future(run(i, check)) for i, check in enumerate(checks)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def run_checks_async(checks: List[Check], **kwargs) -> List[CheckResult]:
+    """
+    Await every check's run() together, returning results in the order of the checks.
+    """
+    results = {
+        index: result async for index, result in iter_checks_async(checks, **kwargs)
+    }
+    return [result for index in sorted(results) for result in results[index]]
@@ -0,0 +1,62 @@
+import json
+import logging
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+
+from .clients import redis_client
+
+logger = logging.getLogger("django")
+
+HEARTBEAT_BUFFER_KEY = "beat-heartbeats"
+LATEST_HEARTBEAT_KEY = "beat-heartbeat:latest"
+
+
+def record_heartbeat(taskid: str, timestamp: datetime):
+    heartbeat = json.dumps({"taskid": taskid, "timestamp": timestamp.isoformat()})
+
+    pipeline = redis_client().pipeline()
+    pipeline.rpush(HEARTBEAT_BUFFER_KEY, heartbeat)
+    pipeline.set(LATEST_HEARTBEAT_KEY, heartbeat)
+    pipeline.execute()
+
+
+def latest_heartbeat() -> Optional[dict]:
+    try:
+        heartbeat = redis_client().get(LATEST_HEARTBEAT_KEY)
+    except Exception as e:
+        logger.error(f"Unable to read the latest heartbeat: {e}")
+        return None
+
+    if heartbeat is None:
+        return None
+
+    heartbeat = json.loads(heartbeat)
+    heartbeat["timestamp"] = datetime.fromisoformat(heartbeat["timestamp"])
+    return heartbeat
+
+
+def flush_heartbeats() -> int:
+    from .models import ScheduledTask
+
+    r = redis_client()
+    batch_size = settings.HEARTBEAT_FLUSH_BATCH_SIZE
+    flushed = 0
+
+    while True:
+        heartbeats = r.lrange(HEARTBEAT_BUFFER_KEY, 0, batch_size - 1)
+        if not heartbeats:
+            return flushed
+
+        ScheduledTask.objects.bulk_create(
+            ScheduledTask(
+                taskid=heartbeat["taskid"],
+                timestamp=datetime.fromisoformat(heartbeat["timestamp"]),
+            )
+            for heartbeat in map(json.loads, heartbeats)
+        )
+        # New heartbeats are pushed onto the other end, so only trim once the rows
+        # are safely written
+        r.ltrim(HEARTBEAT_BUFFER_KEY, len(heartbeats), -1)
+        flushed += len(heartbeats)
@@ -0,0 +1,64 @@
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+from typing import Iterable
+from typing import List
+
+_listeners: List[QueueListener] = []
+
+
+def _restart_listeners():
+    # A forked child, such as a Celery pool process, has none of the parent's threads
+    for listener in _listeners:
+        listener._thread = None
+        listener.start()
+
+
+def _stop_listeners():
+    for listener in _listeners:
+        if listener._thread is not None:
+            listener.stop()
+
+
+def enqueue_handlers(logger_names: Iterable[str]):
+    """
+    Put a queue in front of every handler of the given loggers.
+
+    Records are still filtered and formatted in the thread that logs them, so request
+    ids and trace ids are taken from the right context, but writing them out happens
+    on a background thread per handler.
+    """
+    queued = {}
+    for name in logger_names:
+        logger = logging.getLogger(name or None)
+        for handler in list(logger.handlers):
+            if isinstance(handler, QueueHandler):
+                continue
+            if handler not in queued:
+                queued[handler] = _queue_handler(handler)
+            logger.removeHandler(handler)
+            logger.addHandler(queued[handler])
+
+
+def _queue_handler(handler: logging.Handler) -> QueueHandler:
+    queue_handler = QueueHandler(queue.SimpleQueue())
+    queue_handler.setLevel(handler.level)
+    queue_handler.setFormatter(handler.formatter)
+    for log_filter in handler.filters:
+        queue_handler.addFilter(log_filter)
+
+    # The record arrives already formatted, so the handler only has to write it
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.filters = []
+
+    if not _listeners:
+        atexit.register(_stop_listeners)
+        os.register_at_fork(after_in_child=_restart_listeners)
+
+    listener = QueueListener(queue_handler.queue, handler)
+    listener.start()
+    _listeners.append(listener)
+    return queue_handler
@@ -1,70 +1,209 @@
-import logging
+import hashlib
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from time import monotonic
 
-import boto3
-import redis
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from opensearchpy import OpenSearch
+from django.core.management.base import CommandError
+from django.db import connections
+from opensearchpy.exceptions import NotFoundError
 
+from app.clients import opensearch_client
+from app.clients import redis_client
+from app.clients import s3_client
 from app.models import SampleTable
+from app.models import SeedManifest
+
+SAMPLE_FILE = "sample_file.txt"
+DATABASE_SEED = {"sample_id": 1, "sample_name": "Database is connected"}
+REDIS_SEED = "Test content read from Redis"
+OPENSEARCH_SEED = {
+    "author": "author_name",
+    "text": "Test content read from OpenSearch.",
+}
+
+FINGERPRINT_KEY = "seed-fingerprint"
+
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024, multipart_chunksize=8 * 1024 * 1024
+)
+
+
+def seed_fingerprint() -> str:
+    digest = hashlib.sha256()
+    digest.update(
+        json.dumps(
+            [DATABASE_SEED, REDIS_SEED, OPENSEARCH_SEED], sort_keys=True
+        ).encode()
+    )
+    with open(SAMPLE_FILE, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 class Command(BaseCommand):
+    help = "Seed each configured backend with the data the landing page checks read"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check-only",
+            action="store_true",
+            help="Report which backends are out of date without writing to them",
+        )
+
     def handle(self, *args, **options):
         if os.getenv("IS_API"):
             return
 
-        if settings.RDS_POSTGRES_CREDENTIALS:
-            SampleTable.objects.update_or_create(
-                sample_id=1, sample_name="Database is connected"
-            )
+        targets = self.targets()
+        if not targets:
+            return
 
-        if settings.REDIS_ENDPOINT:
-            r = redis.Redis.from_url(f"{settings.REDIS_ENDPOINT}")
-            r.set("test-data", "Test content read from Redis")
+        fingerprint = seed_fingerprint()
+        check_only = options["check_only"]
 
-        if settings.S3_BUCKET_NAME:
-            object_name = os.path.basename("sample_file.txt")
-            s3_client = boto3.client("s3")
-            try:
-                s3_client.upload_file(object_name, settings.S3_BUCKET_NAME, object_name)
-            except ClientError as e:
-                logging.error(e)
+        with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+            futures = [
+                (
+                    name,
+                    executor.submit(
+                        self.sync, fingerprint, check_only, read, seed, *args
+                    ),
+                )
+                for name, read, seed, *args in targets
+            ]
 
-        if settings.ADDITIONAL_S3_BUCKET_NAME:
-            object_name = os.path.basename("sample_file.txt")
-            s3_client = boto3.client("s3")
+        errors = []
+        stale = []
+        for name, future in futures:
             try:
-                s3_client.upload_file(
-                    object_name, settings.ADDITIONAL_S3_BUCKET_NAME, object_name
+                up_to_date, elapsed = future.result()
+            except (S3UploadFailedError, ClientError) as e:
+                # S3 failures are reported without failing the command, which would
+                # stop the web service starting. This environment often only has
+                # read access to the cross environment buckets.
+                self.stderr.write(f"Failed to seed {name}: {e}")
+                continue
+            except Exception as e:
+                self.stderr.write(f"Failed to seed {name}: {e}")
+                errors.append(e)
+                continue
+
+            if up_to_date:
+                self.stdout.write(f"{name} is up to date ({elapsed:.2f}s)")
+            elif check_only:
+                self.stdout.write(f"{name} is out of date ({elapsed:.2f}s)")
+                stale.append(name)
+            else:
+                self.stdout.write(f"Seeded {name} in {elapsed:.2f}s")
+
+        if errors:
+            raise errors[0]
+        if stale:
+            raise CommandError(f"Seed data is out of date for {', '.join(stale)}")
+
+    def targets(self):
+        targets = []
+
+        if settings.RDS_POSTGRES_CREDENTIALS:
+            targets.append(("database", self.database_fingerprint, self.seed_database))
+
+        if settings.REDIS_ENDPOINT:
+            targets.append(("redis", self.redis_fingerprint, self.seed_redis))
+
+        buckets = [settings.S3_BUCKET_NAME, settings.ADDITIONAL_S3_BUCKET_NAME] + [
+            bucket.strip()
+            for bucket in settings.S3_CROSS_ENVIRONMENT_BUCKET_NAMES.split(",")
+        ]
+        for bucket in filter(None, buckets):
+            targets.append(
+                (
+                    f"S3 bucket {bucket}",
+                    self.bucket_fingerprint,
+                    self.seed_bucket,
+                    bucket,
                 )
-            except ClientError as e:
-                logging.error(e)
-
-        if settings.S3_CROSS_ENVIRONMENT_BUCKET_NAMES:
-            object_name = os.path.basename("sample_file.txt")
-            s3_client = boto3.client("s3")
-            buckets = [
-                bucket
-                for bucket in settings.S3_CROSS_ENVIRONMENT_BUCKET_NAMES.split(",")
-                if bucket.strip()
-            ]
-            for bucket in buckets:
-                try:
-                    s3_client.upload_file(object_name, bucket, object_name)
-                except (boto3.exceptions.S3UploadFailedError, ClientError) as e:
-                    logging.error(e)
+            )
 
         if settings.OPENSEARCH_ENDPOINT:
-            opensearch_client = OpenSearch(f"{settings.OPENSEARCH_ENDPOINT}")
-
-            doc = {
-                "author": "author_name",
-                "text": "Test content read from OpenSearch.",
-                "timestamp": datetime.utcnow(),
-            }
-            response = opensearch_client.index(index="test-index", id=1, body=doc)
-            print(response["result"])
+            targets.append(
+                ("OpenSearch", self.opensearch_fingerprint, self.seed_opensearch)
+            )
+
+        return targets
+
+    def sync(self, fingerprint, check_only, read, seed, *args):
+        start = monotonic()
+        try:
+            up_to_date = read(*args) == fingerprint
+            if not up_to_date and not check_only:
+                seed(fingerprint, *args)
+        finally:
+            # Each target runs in its own thread, so release its DB connection
+            connections.close_all()
+        return up_to_date, monotonic() - start
+
+    def database_fingerprint(self):
+        return (
+            SeedManifest.objects.filter(backend="database")
+            .values_list("fingerprint", flat=True)
+            .first()
+        )
+
+    def seed_database(self, fingerprint):
+        SampleTable.objects.update_or_create(**DATABASE_SEED)
+        SeedManifest.objects.update_or_create(
+            backend="database", defaults={"fingerprint": fingerprint}
+        )
+
+    def redis_fingerprint(self):
+        fingerprint = redis_client().get(FINGERPRINT_KEY)
+        return fingerprint.decode() if fingerprint else None
+
+    def seed_redis(self, fingerprint):
+        pipeline = redis_client().pipeline()
+        pipeline.set("test-data", REDIS_SEED)
+        pipeline.set(FINGERPRINT_KEY, fingerprint)
+        pipeline.execute()
+
+    def bucket_fingerprint(self, bucket):
+        try:
+            response = s3_client().head_object(Bucket=bucket, Key=SAMPLE_FILE)
+        except ClientError:
+            return None
+        return response.get("Metadata", {}).get(FINGERPRINT_KEY)
+
+    def seed_bucket(self, fingerprint, bucket):
+        object_name = os.path.basename(SAMPLE_FILE)
+        s3_client().upload_file(
+            object_name,
+            bucket,
+            object_name,
+            ExtraArgs={"Metadata": {FINGERPRINT_KEY: fingerprint}},
+            Config=TRANSFER_CONFIG,
+        )
+
+    def opensearch_fingerprint(self):
+        try:
+            response = opensearch_client().get(
+                index="test-index", id=1, _source_includes="seed_fingerprint"
+            )
+        except NotFoundError:
+            return None
+        return response["_source"].get("seed_fingerprint")
+
+    def seed_opensearch(self, fingerprint):
+        doc = {
+            **OPENSEARCH_SEED,
+            "timestamp": datetime.utcnow(),
+            "seed_fingerprint": fingerprint,
+        }
+        response = opensearch_client().index(index="test-index", id=1, body=doc)
+        self.stdout.write(response["result"])
@@ -0,0 +1,165 @@
+import logging
+import threading
+from collections import defaultdict
+from collections import deque
+from typing import Dict
+from typing import List
+
+from django.conf import settings
+
+from .clients import redis_client
+
+logger = logging.getLogger("django")
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+_lock = threading.Lock()
+_calls: Dict[str, int] = defaultdict(int)
+_failures: Dict[str, int] = defaultdict(int)
+_latency_sum: Dict[str, float] = defaultdict(float)
+_latencies: Dict[str, deque] = {}
+
+
+def record(test_id: str, seconds: float, success: bool):
+    if settings.CHECK_METRICS_REDIS:
+        try:
+            _record_shared(test_id, seconds, success)
+            return
+        except Exception as e:
+            logger.error(f"Unable to record metrics for {test_id}: {e}")
+
+    with _lock:
+        _calls[test_id] += 1
+        _failures[test_id] += 0 if success else 1
+        _latency_sum[test_id] += seconds
+        if test_id not in _latencies:
+            _latencies[test_id] = deque(maxlen=settings.CHECK_METRICS_WINDOW)
+        _latencies[test_id].append(seconds)
+
+
+def _record_shared(test_id: str, seconds: float, success: bool):
+    # Every gunicorn worker writes to the same keys, so any of them can serve /metrics
+    pipeline = redis_client().pipeline(transaction=False)
+    pipeline.hincrby("check-metrics:calls", test_id, 1)
+    pipeline.hincrby("check-metrics:failures", test_id, 0 if success else 1)
+    pipeline.hincrbyfloat("check-metrics:latency-sum", test_id, seconds)
+    pipeline.lpush(f"check-metrics:latencies:{test_id}", seconds)
+    pipeline.ltrim(
+        f"check-metrics:latencies:{test_id}", 0, settings.CHECK_METRICS_WINDOW - 1
+    )
+    pipeline.execute()
+
+
+def collect() -> Dict[str, dict]:
+    if settings.CHECK_METRICS_REDIS:
+        try:
+            return _collect_shared()
+        except Exception as e:
+            logger.error(f"Unable to read shared metrics: {e}")
+
+    with _lock:
+        return {
+            test_id: {
+                "calls": calls,
+                "failures": _failures[test_id],
+                "latency_sum": _latency_sum[test_id],
+                "latencies": list(_latencies[test_id]),
+            }
+            for test_id, calls in _calls.items()
+        }
+
+
+def _collect_shared() -> Dict[str, dict]:
+    r = redis_client()
+    calls = r.hgetall("check-metrics:calls")
+    failures = r.hgetall("check-metrics:failures")
+    latency_sums = r.hgetall("check-metrics:latency-sum")
+
+    pipeline = r.pipeline(transaction=False)
+    for test_id in calls:
+        pipeline.lrange(f"check-metrics:latencies:{test_id.decode()}", 0, -1)
+    latencies = pipeline.execute()
+
+    return {
+        test_id.decode(): {
+            "calls": int(calls[test_id]),
+            "failures": int(failures.get(test_id, 0)),
+            "latency_sum": float(latency_sums.get(test_id, 0)),
+            "latencies": [float(latency) for latency in samples],
+        }
+        for test_id, samples in zip(calls, latencies)
+    }
+
+
+def reset():
+    with _lock:
+        _calls.clear()
+        _failures.clear()
+        _latency_sum.clear()
+        _latencies.clear()
+
+
+def quantile(samples: List[float], q: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def _sample(name: str, value, **labels) -> str:
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    value_text = "NaN" if value != value else value
+    return f"{name}{{{label_text}}} {value_text}"
+
+
+def render_prometheus() -> str:
+    metrics = sorted(collect().items())
+
+    lines = [
+        "# HELP demodjango_check_calls_total Number of times each check has run.",
+        "# TYPE demodjango_check_calls_total counter",
+    ]
+    for test_id, values in metrics:
+        lines.append(
+            _sample("demodjango_check_calls_total", values["calls"], test_id=test_id)
+        )
+
+    lines += [
+        "# HELP demodjango_check_failures_total Number of times each check has failed.",
+        "# TYPE demodjango_check_failures_total counter",
+    ]
+    for test_id, values in metrics:
+        lines.append(
+            _sample(
+                "demodjango_check_failures_total", values["failures"], test_id=test_id
+            )
+        )
+
+    lines += [
+        "# HELP demodjango_check_latency_seconds Latency of the most recent calls.",
+        "# TYPE demodjango_check_latency_seconds summary",
+    ]
+    for test_id, values in metrics:
+        for q in QUANTILES:
+            lines.append(
+                _sample(
+                    "demodjango_check_latency_seconds",
+                    quantile(values["latencies"], q),
+                    test_id=test_id,
+                    quantile=q,
+                )
+            )
+        lines += [
+            _sample(
+                "demodjango_check_latency_seconds_sum",
+                values["latency_sum"],
+                test_id=test_id,
+            ),
+            _sample(
+                "demodjango_check_latency_seconds_count",
+                values["calls"],
+                test_id=test_id,
+            ),
+        ]
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,24 @@
+from . import views
+
+PROBES = {
+    "/healthz": views.healthz,
+    "/readyz": views.readyz,
+}
+
+
+class ProbeMiddleware:
+    """
+    Answer liveness and readiness probes before the rest of the middleware runs.
+
+    Orchestrator probes arrive every few seconds, so they skip the host validation,
+    session, CSRF, authentication and request logging that the other views need.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        probe = PROBES.get(request.path_info)
+        if probe is not None:
+            return probe(request)
+        return self.get_response(request)
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.8 on 2026-10-18 10:13
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0004_rename_sampleid_sampletable_sample_id_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SeedManifest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("backend", models.CharField(max_length=60, unique=True)),
+                ("fingerprint", models.CharField(max_length=64)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.8 on 2026-10-18 10:40
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0005_seedmanifest"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="scheduledtask",
+            options={"get_latest_by": "timestamp"},
+        ),
+        migrations.AddIndex(
+            model_name="scheduledtask",
+            index=models.Index(
+                fields=["-timestamp"], name="scheduledtask_timestamp_desc"
+            ),
+        ),
+    ]
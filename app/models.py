@@ -18,3 +18,15 @@ class SampleTable(models.Model):
 class ScheduledTask(models.Model):
     taskid = models.CharField(max_length=50)
     timestamp = models.DateTimeField()
+
+    class Meta:
+        get_latest_by = "timestamp"
+        indexes = [
+            models.Index(fields=["-timestamp"], name="scheduledtask_timestamp_desc"),
+        ]
+
+
+class SeedManifest(models.Model):
+    backend = models.CharField(max_length=60, unique=True)
+    fingerprint = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
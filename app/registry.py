@@ -0,0 +1,89 @@
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Type
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import autodiscover_modules
+
+from .util import Check
+
+_registered: List[Type[Check]] = []
+_checks: Optional[List[Check]] = None
+_active_checks: Optional[List[Check]] = None
+
+
+def register(cls: Type[Check]) -> Type[Check]:
+    _registered.append(cls)
+    return cls
+
+
+def registered_checks() -> List[Check]:
+    global _checks
+    if _checks is None:
+        autodiscover_modules("checks")
+        # Mandatory checks come first, then the rest in their landing page order
+        _checks = sorted(
+            (cls() for cls in _registered),
+            key=lambda check: (not check.mandatory, check.order),
+        )
+    return _checks
+
+
+def active_checks() -> List[Check]:
+    global _active_checks
+    if _active_checks is None:
+        _active_checks = [
+            check
+            for check in registered_checks()
+            if check.mandatory
+            or not settings.ACTIVE_CHECKS
+            or check.test_id in settings.ACTIVE_CHECKS
+        ]
+    return _active_checks
+
+
+def mandatory_checks() -> List[Check]:
+    return [check for check in registered_checks() if check.mandatory]
+
+
+def active_optional_checks() -> List[Check]:
+    return [check for check in active_checks() if not check.mandatory]
+
+
+def snapshot_checks() -> List[Check]:
+    return [check for check in active_optional_checks() if check.snapshot]
+
+
+def live_checks() -> List[Check]:
+    """
+    Return the checks run on each page even when the rest are read from a snapshot.
+    """
+    return [check for check in active_checks() if check.mandatory or not check.snapshot]
+
+
+def critical_checks() -> List[Check]:
+    return [check for check in active_checks() if check.critical]
+
+
+def select_checks(
+    checks: List[Check],
+    test_ids: Iterable[str] = None,
+    tags: Iterable[str] = None,
+) -> List[Check]:
+    test_ids, tags = set(test_ids or ()), set(tags or ())
+    return [
+        check
+        for check in checks
+        if (not test_ids or check.test_id in test_ids)
+        and (not tags or tags.intersection(check.tags))
+    ]
+
+
+@receiver(setting_changed)
+def _reset_active_checks(setting, **kwargs):
+    global _active_checks
+    if setting == "ACTIVE_CHECKS":
+        _active_checks = None
@@ -0,0 +1,64 @@
+import json
+from datetime import datetime
+from typing import List
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.http import JsonResponse
+
+from .util import CheckResult
+from .util import dumps
+
+# Fragments of responses that never change, encoded once at import
+SUCCESS_CONTENT = dumps({"message": "Success"})
+API_PREFIX = b'{"message":"Success","timestamp":'
+CHECK_RESULTS_PREFIX = b'{"check_results":'
+
+
+class FastJsonResponse(HttpResponse):
+    """
+    An HttpResponse for content that is already encoded as JSON.
+    """
+
+    def __init__(self, content: bytes, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content, **kwargs)
+
+
+def json_response(data: dict, status: int = 200) -> HttpResponse:
+    if settings.FAST_JSON:
+        return FastJsonResponse(dumps(data), status=status)
+    return JsonResponse(data, status=status)
+
+
+def success_response() -> HttpResponse:
+    if settings.FAST_JSON:
+        return FastJsonResponse(SUCCESS_CONTENT)
+    return JsonResponse({"message": "Success"})
+
+
+def api_response(timestamp: datetime) -> HttpResponse:
+    if settings.FAST_JSON:
+        # An ISO 8601 timestamp never needs escaping, so it is spliced in as it is
+        return FastJsonResponse(
+            API_PREFIX + b'"' + timestamp.isoformat().encode() + b'"}'
+        )
+    return JsonResponse({"message": "Success", "timestamp": timestamp.isoformat()})
+
+
+def check_results_response(
+    results: List[CheckResult], status: int = 200
+) -> HttpResponse:
+    if settings.FAST_JSON:
+        return FastJsonResponse(
+            CHECK_RESULTS_PREFIX + dumps(results) + b"}", status=status
+        )
+    return JsonResponse(
+        {"check_results": [result.to_dict() for result in results]}, status=status
+    )
+
+
+def check_result_line(result: CheckResult):
+    if settings.FAST_JSON:
+        return dumps(result) + b"\n"
+    return f"{json.dumps(result.to_dict())}\n"
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from typing import List
+from typing import Optional
+
+import orjson
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .clients import redis_client
+from .util import Check
+from .util import CheckResult
+from .util import dumps
+from .util import results_from_json
+
+logger = logging.getLogger("django")
+
+# Seconds between reads while waiting on another worker's result
+POLL_INTERVAL = 0.05
+
+
+class Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.results = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent runs of the same check, keyed by test_id.
+
+    Callers arriving while a check is already running wait for that run and share
+    its results instead of probing the backend again. With CHECK_SINGLEFLIGHT_REDIS
+    set, a Redis lock extends this across workers: the worker holding the lock runs
+    the check and publishes the results for the others to read.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    def call(self, check: Check) -> List[CheckResult]:
+        with self._lock:
+            flight = self._flights.get(check.test_id)
+            leader = flight is None
+            if leader:
+                flight = self._flights[check.test_id] = Flight()
+
+        if not leader:
+            # Starting another probe would add to the load on a backend that is
+            # already slow, so callers that give up waiting report a timeout instead
+            if not flight.done.wait(self._timeout(check)):
+                return [check.timed_out_result(self._timeout(check))]
+            if flight.error is not None:
+                raise flight.error
+            return flight.results
+
+        try:
+            flight.results = self._call_shared(check)
+            return flight.results
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[check.test_id]
+            flight.done.set()
+
+    async def run(self, check: Check) -> List[CheckResult]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            task = self._tasks.get(check.test_id)
+            if task is None or task.done() or task.get_loop() is not loop:
+                task = self._tasks[check.test_id] = loop.create_task(
+                    self._run_shared(check)
+                )
+                task.add_done_callback(lambda t: self._forget(check.test_id, t))
+
+        # A caller that is cancelled must not cancel the run the others wait on
+        return await asyncio.shield(task)
+
+    def _forget(self, test_id: str, task: asyncio.Task):
+        with self._lock:
+            if self._tasks.get(test_id) is task:
+                del self._tasks[test_id]
+
+    def _timeout(self, check: Check) -> float:
+        return check.timeout or settings.CHECK_TIMEOUT
+
+    def _call_shared(self, check: Check) -> List[CheckResult]:
+        if not settings.CHECK_SINGLEFLIGHT_REDIS:
+            return check()
+
+        token, claimed = self._claim(check)
+        if not claimed:
+            results = self._wait(check, token)
+            return results if results is not None else check()
+
+        try:
+            results = check()
+            self._publish(check, token, results)
+            return results
+        finally:
+            self._release(check, token)
+
+    async def _run_shared(self, check: Check) -> List[CheckResult]:
+        if not settings.CHECK_SINGLEFLIGHT_REDIS:
+            return await check.run()
+
+        token, claimed = await sync_to_async(self._claim, thread_sensitive=False)(check)
+        if not claimed:
+            results = await sync_to_async(self._wait, thread_sensitive=False)(
+                check, token
+            )
+            return results if results is not None else await check.run()
+
+        try:
+            results = await check.run()
+            await sync_to_async(self._publish, thread_sensitive=False)(
+                check, token, results
+            )
+            return results
+        finally:
+            await sync_to_async(self._release, thread_sensitive=False)(check, token)
+
+    def _claim(self, check: Check):
+        """
+        Return the token of the run in flight and whether this worker claimed it.
+        If Redis is unavailable the caller runs the check itself.
+        """
+        token = uuid.uuid4().hex
+        try:
+            r = redis_client()
+            while True:
+                if r.set(
+                    f"check-flight:{check.test_id}",
+                    token,
+                    nx=True,
+                    ex=max(int(self._timeout(check)), 1),
+                ):
+                    return token, True
+                current = r.get(f"check-flight:{check.test_id}")
+                # The lock may have been released between the two commands
+                if current is not None:
+                    return current.decode(), False
+        except Exception as e:
+            logger.error(f"Unable to coordinate {check.test_id} through Redis: {e}")
+            return None, True
+
+    def _wait(self, check: Check, token: str) -> Optional[List[CheckResult]]:
+        """
+        Return the results published by the worker running the check, or a timed out
+        result if they do not arrive in time. Returns None only if Redis cannot be
+        read, in which case the caller runs the check itself.
+        """
+        deadline = time.monotonic() + self._timeout(check)
+        try:
+            r = redis_client()
+            while time.monotonic() < deadline:
+                published = r.get(f"check-flight-result:{check.test_id}:{token}")
+                if published is not None:
+                    return results_from_json(orjson.loads(published))
+                time.sleep(POLL_INTERVAL)
+        except Exception as e:
+            logger.error(f"Unable to read {check.test_id} results from Redis: {e}")
+            return None
+        return [check.timed_out_result(self._timeout(check))]
+
+    def _publish(self, check: Check, token: str, results: List[CheckResult]):
+        if token is None:
+            return
+        try:
+            redis_client().set(
+                f"check-flight-result:{check.test_id}:{token}",
+                dumps(results),
+                ex=max(int(self._timeout(check)), 1),
+            )
+        except Exception as e:
+            logger.error(f"Unable to publish {check.test_id} results to Redis: {e}")
+
+    def _release(self, check: Check, token: str):
+        if token is None:
+            return
+        try:
+            r = redis_client()
+            if r.get(f"check-flight:{check.test_id}") == token.encode():
+                r.delete(f"check-flight:{check.test_id}")
+        except Exception as e:
+            logger.error(f"Unable to release {check.test_id} lock in Redis: {e}")
+
+
+singleflight = SingleFlight()
@@ -0,0 +1,45 @@
+import logging
+import time
+from typing import List
+from typing import Optional
+
+import orjson
+from django.conf import settings
+
+from .clients import redis_client
+from .util import CheckResult
+from .util import dumps
+from .util import results_from_json
+
+logger = logging.getLogger("django")
+
+SNAPSHOT_KEY = "check-snapshot"
+
+
+def save_snapshot(results: List[CheckResult]):
+    redis_client().set(
+        SNAPSHOT_KEY,
+        dumps({"taken_at": time.time(), "results": results}),
+        ex=max(int(settings.CHECK_SNAPSHOT_MAX_AGE), 1),
+    )
+
+
+def load_snapshot() -> Optional[List[CheckResult]]:
+    try:
+        snapshot = redis_client().get(SNAPSHOT_KEY)
+    except Exception as e:
+        logger.error(f"Unable to read check snapshot: {e}")
+        return None
+
+    if snapshot is None:
+        return None
+
+    data = orjson.loads(snapshot)
+    age = max(time.time() - data["taken_at"], 0)
+    if age > settings.CHECK_SNAPSHOT_MAX_AGE:
+        return None
+
+    return [
+        result.with_cache_age(round(age, 3))
+        for result in results_from_json(data["results"])
+    ]
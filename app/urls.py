@@ -8,11 +8,20 @@ if settings.IS_API:
     api_patterns = [
         path("", views.api, name="api"),
         path("test-web/", views.test_web, name="test-web"),
+        path("healthz", views.healthz, name="healthz"),
+        path("readyz", views.readyz, name="readyz"),
     ]
     urlpatterns = [path("", include(api_patterns), name="api")]
 else:
     web_patterns = [
-        path("", views.index, name="index"),
+        path(
+            "",
+            views.async_index if settings.ASYNC_CHECKS else views.index,
+            name="index",
+        ),
+        path("metrics", views.metrics, name="metrics"),
+        path("healthz", views.healthz, name="healthz"),
+        path("readyz", views.readyz, name="readyz"),
         path("ipfilter/", views.ipfilter, name="ipfilter"),
         path(
             "ipfilter-basic-auth/",
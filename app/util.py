@@ -1,37 +1,190 @@
+import functools
 import logging
-
+import random
+from contextvars import ContextVar
+from dataclasses import dataclass
+from dataclasses import replace
+from datetime import datetime
+from datetime import timezone
+from time import monotonic
+from typing import List
+from typing import Optional
+
+import orjson
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
 from normality import slugify
 
+from . import breaker
+from . import metrics
+
 logger = logging.getLogger("django")
 
+# Set while a check is being timed so nested calls, such as run() falling back to
+# __call__, are only recorded and guarded by the circuit breaker once
+_timing = ContextVar("timing", default=False)
+
+
+async def run_blocking(blocking: bool, func, *args):
+    """
+    Await func(*args), calling it from a worker thread when it may block on I/O such
+    as Redis so that it does not hold up the event loop.
+    """
+    if blocking:
+        return await sync_to_async(func, thread_sensitive=False)(*args)
+    return func(*args)
+
+
+def _record(check, elapsed, results):
+    success = results is not None and all(result.success for result in results)
+    metrics.record(check.test_id, elapsed, success)
+    # A check reporting several buckets or URLs only trips its breaker when none of
+    # them can be reached, so one bad item does not hide the results of the others
+    reachable = results is not None and (
+        not results or any(result.success for result in results)
+    )
+    # A run that overran is only recorded here, once it has finished in the
+    # background, and only against the check's own timeout rather than the shorter
+    # deadline of a page or readiness probe that gave up waiting for it
+    if elapsed > (check.timeout or settings.CHECK_TIMEOUT):
+        reachable = False
+    breaker.record(check, reachable)
+
+
+def _timed(call):
+    @functools.wraps(call)
+    def timed_call(self, *args, **kwargs):
+        if _timing.get():
+            return call(self, *args, **kwargs)
+
+        opened_at = breaker.opened_since(self)
+        if opened_at is not None:
+            return [self.circuit_open_result(opened_at)]
+
+        token = _timing.set(True)
+        start, results = monotonic(), None
+        try:
+            results = call(self, *args, **kwargs)
+            return results
+        finally:
+            _timing.reset(token)
+            _record(self, monotonic() - start, results)
+
+    return timed_call
+
+
+def _timed_async(run):
+    @functools.wraps(run)
+    async def timed_run(self, *args, **kwargs):
+        if _timing.get():
+            return await run(self, *args, **kwargs)
+
+        # Shared breaker state and metrics live in Redis, which must not block the
+        # event loop
+        opened_at = await run_blocking(
+            settings.CHECK_BREAKER_REDIS, breaker.opened_since, self
+        )
+        if opened_at is not None:
+            return [self.circuit_open_result(opened_at)]
+
+        token = _timing.set(True)
+        start, results = monotonic(), None
+        try:
+            results = await run(self, *args, **kwargs)
+            return results
+        finally:
+            _timing.reset(token)
+            await run_blocking(
+                settings.CHECK_BREAKER_REDIS or settings.CHECK_METRICS_REDIS,
+                _record,
+                self,
+                monotonic() - start,
+                results,
+            )
+
+    return timed_run
+
 
 STATUS_SUCCESS = "✓"
 STATUS_FAIL = "✗"
 
 
 class Check:
+    # Seconds to cache results for, overriding CHECK_CACHE_TTL; 0 disables caching
+    cache_ttl = None
+    # Seconds the check may run for, overriding CHECK_TIMEOUT
+    timeout = None
+    # Mandatory checks run whatever ACTIVE_CHECKS says
+    mandatory = False
+    # The service cannot do useful work while a critical check is failing
+    critical = False
+    tags = ()
+    # Position on the landing page, after the mandatory checks
+    order = 0
+    # Snapshot checks are run by Celery beat rather than on each page when
+    # CHECK_SNAPSHOTS is set
+    snapshot = True
+    # Checks sharing a concurrency group never run at the same time
+    concurrency_group = None
+    # Consecutive failures before the circuit breaker opens, overriding
+    # CHECK_BREAKER_THRESHOLD; 0 disables the breaker
+    breaker_threshold = None
+    # Seconds an open breaker refuses calls for, overriding CHECK_BREAKER_COOLDOWN
+    breaker_cooldown = None
+
     def __init__(self, test_id: str, description: str, logger=None):
         self.test_id = test_id
         self.description = description
         self.logger = logger
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "__call__" in cls.__dict__:
+            cls.__call__ = _timed(cls.__dict__["__call__"])
+        if "run" in cls.__dict__:
+            cls.run = _timed_async(cls.__dict__["run"])
+
     def __call__(self):
         raise NotImplementedError(
             "Call function needs to be implemented in the subclass"
         )
 
+    async def run(self):
+        # Checks without a native async implementation run their blocking call in a thread
+        return await sync_to_async(self._call_in_thread, thread_sensitive=False)()
+
+    def _call_in_thread(self):
+        try:
+            return self()
+        finally:
+            # Under ASGI the executor's threads outlive the request, and Django only
+            # closes or expires connections at the end of one
+            connections.close_all()
+
     def result(self, success, message):
         return CheckResult(self.test_id, self.description, success, message)
 
+    def timed_out_result(self, timeout: float):
+        return self.result(
+            False, f"{self.description} timed out after {timeout:g} seconds"
+        )
 
+    def circuit_open_result(self, opened_at: float):
+        since = datetime.fromtimestamp(opened_at, timezone.utc)
+        return self.result(
+            False,
+            f"{self.description} circuit open since {since.isoformat(timespec='seconds')}",
+        )
+
+
+@dataclass(frozen=True, slots=True)
 class CheckResult:
-    def __init__(
-        self, test_id: str, description: str, success: bool, message: str = ""
-    ):
-        self.test_id = test_id
-        self.description = description
-        self.success = success
-        self.message = message
+    test_id: str
+    description: str
+    success: bool
+    message: str = ""
+    cache_age: Optional[float] = None
 
     def to_dict(self):
         return {
@@ -39,17 +192,45 @@ class CheckResult:
             "description": self.description,
             "success": self.success,
             "message": self.message,
+            "cache_age": self.cache_age,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            data["test_id"],
+            data["description"],
+            data["success"],
+            data.get("message", ""),
+            data.get("cache_age"),
+        )
+
+    def with_cache_age(self, cache_age: float):
+        return replace(self, cache_age=cache_age)
+
+
+def dumps(data) -> bytes:
+    # orjson encodes CheckResult dataclasses natively, so whole payloads are written
+    # in one pass without building a dict per result first
+    return orjson.dumps(data)
+
+
+def results_from_json(data: list) -> List[CheckResult]:
+    return [CheckResult.from_dict(result) for result in data]
+
 
 def render_connection_info(check_result: CheckResult):
-    log_detail_base = f"Rendering {check_result.description} stuff "
     if check_result.success:
-        logger.info(f"{log_detail_base} successful")
+        if random.random() < settings.LOG_RESULT_SAMPLE_RATE:
+            logger.info("Rendering %s stuff  successful", check_result.description)
         status_icon = STATUS_SUCCESS
         status_colour = "green"
     else:
-        logger.error(f"{log_detail_base} failed with error: {check_result.message}")
+        logger.error(
+            "Rendering %s stuff  failed with error: %s",
+            check_result.description,
+            check_result.message,
+        )
         status_icon = STATUS_FAIL
         status_colour = "red"
 
@@ -2,59 +2,80 @@ import base64
 import logging
 from datetime import datetime
 
-from app.checks import (
-    CeleryBeatCheck,
-    CeleryWorkerCheck,
-    GitInformationCheck,
-    HttpConnectionCheck,
-    OpensearchCheck,
-    PostgresRdsCheck,
-    PrivateSubmoduleCheck,
-    ReadWriteCheck,
-    RedisCheck,
-    S3AdditionalBucketCheck,
-    S3BucketCheck,
-    S3CrossEnvironmentBucketChecks,
-    S3StaticBucketCheck,
-    ServerTimeCheck,
-)
 import requests
+from asgiref.sync import sync_to_async
 from authbroker_client.utils import TOKEN_SESSION_KEY
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.http import HttpResponse
 from django.http import HttpResponseRedirect
-from django.http import JsonResponse
+from django.http import StreamingHttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse
 
+from .executor import iter_checks
+from .executor import iter_checks_async
+from .executor import run_checks
+from .executor import run_checks_async
+from .metrics import render_prometheus
+from .registry import active_checks
+from .registry import critical_checks
+from .registry import live_checks
+from .registry import mandatory_checks
+from .registry import select_checks
+from .responses import api_response
+from .responses import check_result_line
+from .responses import check_results_response
+from .responses import json_response
+from .responses import success_response
+from .snapshot import load_snapshot
+from .util import CheckResult
+from .util import dumps
 from .util import render_connection_info
 
 logger = logging.getLogger("django")
 
-MANDATORY_CHECKS = [
-    GitInformationCheck(),
-    ServerTimeCheck(),
-]
-
-OPTIONAL_CHECKS = [
-    CeleryBeatCheck(),
-    CeleryWorkerCheck(logger=logger),
-    HttpConnectionCheck(),
-    OpensearchCheck(logger=logger),
-    PostgresRdsCheck(),
-    PrivateSubmoduleCheck(),
-    ReadWriteCheck(),
-    RedisCheck(),
-    S3BucketCheck(),
-    S3AdditionalBucketCheck(),
-    S3StaticBucketCheck(),
-    S3CrossEnvironmentBucketChecks(),
-]
+PAGE_HEAD = "<!doctype html><html><head><title>DemoDjango</title></head><body>"
+PAGE_TAIL = "</body></html>"
 
+# Liveness does no I/O, so its response never changes
+HEALTHZ_CONTENT = dumps({"check_results": [CheckResult("healthz", "Liveness", True)]})
+
+MANDATORY_CHECKS = mandatory_checks()
+
+
+def query_list(request, name):
+    values = request.GET.get(name, "").split(",")
+    return [value.strip() for value in values if value.strip()]
+
+
+def is_filtered(request):
+    return bool(query_list(request, "checks") or query_list(request, "tags"))
+
+
+def get_requested_checks(request):
+    return select_checks(
+        active_checks(),
+        test_ids=query_list(request, "checks"),
+        tags=query_list(request, "tags"),
+    )
+
+
+def use_snapshot(request):
+    # Snapshots hold every optional check, so filtered requests are always run live
+    return (
+        settings.CHECK_SNAPSHOTS
+        and request.GET.get("live", None) != "true"
+        and not is_filtered(request)
+    )
+
+
+def log_landing_page_request(request):
+    if not logger.isEnabledFor(logging.INFO):
+        return
 
-def index(request):
     logger.info("Rendering landing page")
+    # Only copy the request into dicts when the record will be written
     logger.info(
         {
             "method": request.method,
@@ -65,40 +86,141 @@ def index(request):
         }
     )
 
-    active_checks = MANDATORY_CHECKS + [
-        check
-        for check in OPTIONAL_CHECKS
-        if not settings.ACTIVE_CHECKS or check.test_id in settings.ACTIVE_CHECKS
-    ]
 
-    results = []
+def wants_json(request):
+    return request.GET.get("json", None) == "true"
+
 
-    for check in active_checks:
-        results.extend(check())
+def wants_stream(request):
+    return request.GET.get("stream", None) == "true"
 
+
+def log_landing_page_completed():
     logger.info(
         f"Landing page checks completed: "
         f"{settings.ACTIVE_CHECKS if settings.ACTIVE_CHECKS else 'all'}"
     )
 
-    if request.GET.get("json", None) == "true":
-        results = [result.to_dict() for result in results]
-        return JsonResponse({"check_results": results}, status=200)
+
+def render_landing_page(request, results):
+    log_landing_page_completed()
+
+    if wants_json(request):
+        return check_results_response(results)
     else:
         results = [render_connection_info(result) for result in results]
-        return HttpResponse(
-            "<!doctype html><html><head>"
-            "<title>DemoDjango</title>"
-            "</head><body>"
-            f"{''.join(results)}"
-            "</body></html>"
-        )
+        return HttpResponse(f"{PAGE_HEAD}{''.join(results)}{PAGE_TAIL}")
 
 
-def api(request):
-    response_data = {"message": "Success", "timestamp": datetime.now().isoformat()}
+def format_streamed_result(request, result):
+    if wants_json(request):
+        return check_result_line(result)
+    return render_connection_info(result)
+
+
+def stream_landing_page(request, content):
+    response = StreamingHttpResponse(
+        content,
+        content_type=(
+            "application/x-ndjson"
+            if wants_json(request)
+            else "text/html; charset=utf-8"
+        ),
+    )
+    # Stop proxies holding back fragments until the whole page is complete
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def iter_landing_page(request, snapshot):
+    if not wants_json(request):
+        yield PAGE_HEAD
+
+    checks = live_checks() if snapshot is not None else get_requested_checks(request)
+    for _, results in iter_checks(checks):
+        for result in results:
+            yield format_streamed_result(request, result)
+    for result in snapshot or []:
+        yield format_streamed_result(request, result)
+
+    if not wants_json(request):
+        yield PAGE_TAIL
+    log_landing_page_completed()
+
+
+async def aiter_landing_page(request, snapshot):
+    if not wants_json(request):
+        yield PAGE_HEAD
 
-    return JsonResponse(response_data)
+    checks = live_checks() if snapshot is not None else get_requested_checks(request)
+    async for _, results in iter_checks_async(checks):
+        for result in results:
+            yield format_streamed_result(request, result)
+    for result in snapshot or []:
+        yield format_streamed_result(request, result)
+
+    if not wants_json(request):
+        yield PAGE_TAIL
+    log_landing_page_completed()
+
+
+def index(request):
+    log_landing_page_request(request)
+
+    snapshot = load_snapshot() if use_snapshot(request) else None
+
+    if wants_stream(request):
+        return stream_landing_page(request, iter_landing_page(request, snapshot))
+
+    if snapshot is not None:
+        results = run_checks(live_checks()) + snapshot
+    else:
+        results = run_checks(get_requested_checks(request))
+
+    return render_landing_page(request, results)
+
+
+async def async_index(request):
+    log_landing_page_request(request)
+
+    snapshot = None
+    if use_snapshot(request):
+        snapshot = await sync_to_async(load_snapshot, thread_sensitive=False)()
+
+    if wants_stream(request):
+        return stream_landing_page(request, aiter_landing_page(request, snapshot))
+
+    if snapshot is not None:
+        results = await run_checks_async(live_checks()) + snapshot
+    else:
+        results = await run_checks_async(get_requested_checks(request))
+
+    return render_landing_page(request, results)
+
+
+def healthz(request):
+    return HttpResponse(HEALTHZ_CONTENT, content_type="application/json")
+
+
+def readyz(request):
+    results = run_checks(
+        critical_checks(),
+        check_timeout=settings.READINESS_TIMEOUT,
+        page_timeout=settings.READINESS_TIMEOUT,
+    )
+    return check_results_response(
+        results, status=200 if all(result.success for result in results) else 503
+    )
+
+
+def metrics(request):
+    return HttpResponse(
+        render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def api(request):
+    return api_response(datetime.now())
 
 
 def test_web(request):
@@ -108,20 +230,20 @@ def test_web(request):
     response = requests.get(web_url)
 
     if response.status_code == 200:
-        return JsonResponse(
+        return json_response(
             {"message": f"API reached web service at {web_url}"}, status=200
         )
     else:
-        return JsonResponse(
+        return json_response(
             {"message": f"API failed to reach web service at {web_url}"},
             status=response.status_code,
         )
 
-        
+
 def test_api(request):
     index_url = reverse("index")
     logger.info({"index_url": index_url})
-    
+
     full_index_url = request.build_absolute_uri(index_url)
 
     if "ip-filter-test." in full_index_url:
@@ -131,7 +253,7 @@ def test_api(request):
         logger.info("'web.' is detected")
         api_url = full_index_url.replace("web.", "api.")
     else:
-        api_url = full_index_url  
+        api_url = full_index_url
 
     logger.info({"api_url": api_url})
 
@@ -139,18 +261,18 @@ def test_api(request):
     logger.info({"response.status_code": response.status_code})
 
     if response.status_code == 200:
-        return JsonResponse(
+        return json_response(
             {"message": f"Frontend reached API at {api_url}"}, status=200
         )
     else:
-        return JsonResponse(
+        return json_response(
             {"message": f"Frontend failed to reach API at {api_url}"},
             status=response.status_code,
         )
 
 
 def ipfilter(request):
-    return JsonResponse({"message": f"Success"}, status=200)
+    return success_response()
 
 
 @login_required
@@ -1,7 +1,10 @@
 import logging
 from datetime import datetime
+from datetime import timedelta
 
 from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
 
 logger = logging.getLogger("django")
 
@@ -14,14 +17,62 @@ def demodjango_task(timestamp):
 
 @shared_task(bind=True)
 def demodjango_scheduled_task(self):
+    from app.heartbeats import record_heartbeat
     from app.models import ScheduledTask
 
-    timestamp = datetime.utcnow()
+    if settings.HEARTBEAT_BUFFERING:
+        timestamp = timezone.now()
+        record_heartbeat(self.request.id, timestamp)
+    else:
+        timestamp = datetime.utcnow()
 
-    task = ScheduledTask()
-    task.taskid = self.request.id
-    task.timestamp = timestamp
-    task.save()
+        task = ScheduledTask()
+        task.taskid = self.request.id
+        task.timestamp = timestamp
+        task.save()
 
     logger.info(f"Running demodjango_scheduled_task")
     return f"demodjango_scheduled_task queued at {timestamp}"
+
+
+@shared_task()
+def flush_heartbeats():
+    from app import heartbeats
+
+    flushed = heartbeats.flush_heartbeats()
+
+    logger.info(f"Flushed {flushed} buffered heartbeats")
+    return f"flush_heartbeats wrote {flushed} rows"
+
+
+@shared_task()
+def purge_scheduled_tasks():
+    from app.models import ScheduledTask
+
+    cutoff = timezone.now() - timedelta(days=settings.SCHEDULED_TASK_RETENTION_DAYS)
+    expired = ScheduledTask.objects.filter(timestamp__lt=cutoff)
+
+    # Delete in small batches so a large backlog never holds a long lock on the table
+    batch_size = settings.SCHEDULED_TASK_PURGE_BATCH_SIZE
+    deleted = 0
+    while True:
+        batch = list(expired.values_list("id", flat=True)[:batch_size])
+        if not batch:
+            break
+        deleted += ScheduledTask.objects.filter(id__in=batch).delete()[0]
+
+    logger.info(f"Deleted {deleted} scheduled tasks older than {cutoff}")
+    return f"purge_scheduled_tasks deleted {deleted} rows"
+
+
+@shared_task()
+def run_landing_page_checks():
+    from app.executor import run_checks
+    from app.registry import snapshot_checks
+    from app.snapshot import save_snapshot
+
+    results = run_checks(snapshot_checks(), use_cache=False)
+    save_snapshot(results)
+
+    logger.info(f"Saved snapshot of {len(results)} landing page check results")
+    return f"run_landing_page_checks saved {len(results)} results"
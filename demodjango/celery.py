@@ -2,6 +2,7 @@ import os
 
 from celery import Celery
 from dbt_copilot_python.celery_health_check import healthcheck
+from django.conf import settings
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "demodjango.settings")
 
@@ -16,4 +17,20 @@ celery_app.conf.beat_schedule = {
         "task": "celery_worker.tasks.demodjango_scheduled_task",
         "schedule": 30.0,
     },
+    "purge-scheduled-tasks": {
+        "task": "celery_worker.tasks.purge_scheduled_tasks",
+        "schedule": settings.SCHEDULED_TASK_PURGE_INTERVAL,
+    },
 }
+
+if settings.HEARTBEAT_BUFFERING:
+    celery_app.conf.beat_schedule["flush-heartbeats"] = {
+        "task": "celery_worker.tasks.flush_heartbeats",
+        "schedule": settings.HEARTBEAT_FLUSH_INTERVAL,
+    }
+
+if settings.CHECK_SNAPSHOTS:
+    celery_app.conf.beat_schedule["schedule-landing-page-checks"] = {
+        "task": "celery_worker.tasks.run_landing_page_checks",
+        "schedule": settings.CHECK_SNAPSHOT_INTERVAL,
+    }
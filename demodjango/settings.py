@@ -49,6 +49,37 @@ ACTIVE_CHECKS = list(
     filter(None, [el.strip() for el in env("ACTIVE_CHECKS", default="").split(",")])
 )
 
+CHECK_TIMEOUT = env.float("CHECK_TIMEOUT", default=10.0)
+CHECKS_PAGE_TIMEOUT = env.float("CHECKS_PAGE_TIMEOUT", default=15.0)
+CHECK_MAX_WORKERS = env.int("CHECK_MAX_WORKERS", default=8)
+ASYNC_CHECKS = env.bool("ASYNC_CHECKS", default=False)
+READINESS_TIMEOUT = env.float("READINESS_TIMEOUT", default=2.0)
+FAST_JSON = env.bool("FAST_JSON", default=False)
+JINJA_BYTECODE_CACHE_DIR = env("JINJA_BYTECODE_CACHE_DIR", default=None)
+CHECK_CACHE_TTL = env.float("CHECK_CACHE_TTL", default=10.0)
+CHECK_CACHE_TTLS = {
+    test_id: float(ttl)
+    for test_id, ttl in env.dict("CHECK_CACHE_TTLS", default={}).items()
+}
+CHECK_CACHE_STALE_TTL = env.float("CHECK_CACHE_STALE_TTL", default=60.0)
+CHECK_CACHE_SIZE = env.int("CHECK_CACHE_SIZE", default=128)
+CHECK_CACHE_REDIS = env.bool("CHECK_CACHE_REDIS", default=False)
+CHECK_SINGLEFLIGHT_REDIS = env.bool("CHECK_SINGLEFLIGHT_REDIS", default=False)
+CHECK_BREAKER_THRESHOLD = env.int("CHECK_BREAKER_THRESHOLD", default=5)
+CHECK_BREAKER_COOLDOWN = env.float("CHECK_BREAKER_COOLDOWN", default=30.0)
+CHECK_BREAKER_REDIS = env.bool("CHECK_BREAKER_REDIS", default=False)
+CHECK_METRICS_REDIS = env.bool("CHECK_METRICS_REDIS", default=False)
+CHECK_METRICS_WINDOW = env.int("CHECK_METRICS_WINDOW", default=1000)
+CHECK_SNAPSHOTS = env.bool("CHECK_SNAPSHOTS", default=False)
+CHECK_SNAPSHOT_INTERVAL = env.float("CHECK_SNAPSHOT_INTERVAL", default=30.0)
+CHECK_SNAPSHOT_MAX_AGE = env.float(
+    "CHECK_SNAPSHOT_MAX_AGE", default=CHECK_SNAPSHOT_INTERVAL * 3
+)
+
+HTTP_CHECK_MAX_WORKERS = env.int("HTTP_CHECK_MAX_WORKERS", default=4)
+HTTP_CHECK_CONNECT_TIMEOUT = env.float("HTTP_CHECK_CONNECT_TIMEOUT", default=3.05)
+HTTP_CHECK_READ_TIMEOUT = env.float("HTTP_CHECK_READ_TIMEOUT", default=5.0)
+
 IS_API = env("IS_API", default="False") == "True"
 
 DLFA_INCLUDE_RAW_LOG = True
@@ -111,6 +142,11 @@ LOGGING = {
 
 DLFA_INCLUDE_RAW_LOG = True
 
+# Write log records from background threads instead of the request thread
+LOG_QUEUE = env.bool("LOG_QUEUE", default=False)
+# Fraction of successful check results logged when the landing page is rendered
+LOG_RESULT_SAMPLE_RATE = env.float("LOG_RESULT_SAMPLE_RATE", default=1.0)
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -126,6 +162,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Answers /healthz and /readyz without running the middleware below
+    "app.middleware.ProbeMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -219,9 +257,20 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 RESTRICT_ADMIN = env.bool("RESTRICT_ADMIN", default=True)
 
 REDIS_ENDPOINT = env("REDIS_ENDPOINT", default="")
+REDIS_CONNECT_TIMEOUT = env.float("REDIS_CONNECT_TIMEOUT", default=2.0)
+REDIS_TIMEOUT = env.float("REDIS_TIMEOUT", default=2.0)
 S3_BUCKET_NAME = env("S3_BUCKET_NAME", default="")
 ADDITIONAL_S3_BUCKET_NAME = env("ADDITIONAL_S3_BUCKET_NAME", default="")
 S3_CROSS_ENVIRONMENT_BUCKET_NAMES = env("S3_CROSS_ENVIRONMENT_BUCKET_NAMES", default="")
+S3_CROSS_ENVIRONMENT_MAX_WORKERS = env.int(
+    "S3_CROSS_ENVIRONMENT_MAX_WORKERS", default=8
+)
+S3_CROSS_ENVIRONMENT_PROBE_BYTES = env.int(
+    "S3_CROSS_ENVIRONMENT_PROBE_BYTES", default=64
+)
+S3_TIMEOUT = env.float("S3_TIMEOUT", default=5.0)
+S3_READ_MAX_BYTES = env.int("S3_READ_MAX_BYTES", default=1024)
+S3_CONDITIONAL_READS = env.bool("S3_CONDITIONAL_READS", default=True)
 OPENSEARCH_ENDPOINT = env("OPENSEARCH_ENDPOINT", default="")
 STATIC_S3_ENDPOINT = env("STATIC_S3_ENDPOINT", default="")
 
@@ -235,6 +284,17 @@ CELERY_RESULT_SERIALIZER = "json"
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers.DatabaseScheduler"
 
+SCHEDULED_TASK_RETENTION_DAYS = env.float("SCHEDULED_TASK_RETENTION_DAYS", default=7.0)
+SCHEDULED_TASK_PURGE_INTERVAL = env.float(
+    "SCHEDULED_TASK_PURGE_INTERVAL", default=3600.0
+)
+SCHEDULED_TASK_PURGE_BATCH_SIZE = env.int(
+    "SCHEDULED_TASK_PURGE_BATCH_SIZE", default=1000
+)
+HEARTBEAT_BUFFERING = env.bool("HEARTBEAT_BUFFERING", default=False)
+HEARTBEAT_FLUSH_INTERVAL = env.float("HEARTBEAT_FLUSH_INTERVAL", default=300.0)
+HEARTBEAT_FLUSH_BATCH_SIZE = env.int("HEARTBEAT_FLUSH_BATCH_SIZE", default=500)
+
 # authbroker config
 AUTHBROKER_URL = env("AUTHBROKER_URL", default="")
 AUTHBROKER_CLIENT_ID = env("AUTHBROKER_CLIENT_ID", default="")
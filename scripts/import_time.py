@@ -0,0 +1,98 @@
+"""Report how long a fresh web worker takes to import the application.
+
+Runs `python -X importtime` in a subprocess, so nothing is already imported, and
+summarises the cost per top level package along with the peak memory use.
+
+    python scripts/import_time.py
+    python scripts/import_time.py --top 10 --output import_time.json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+PROGRAM = """
+import resource
+import {module}
+import app.urls
+print("max_rss", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def measure(module):
+    env = {
+        "DJANGO_SETTINGS_MODULE": "demodjango.settings",
+        "DJANGO_SECRET_KEY": "import-time",
+        **os.environ,
+    }
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROGRAM.format(module=module)],
+        cwd=BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total_us = 0
+    packages = defaultdict(int)
+    for line in process.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        packages[name.split(".")[0]] += int(self_us)
+        if not indent:
+            total_us += int(cumulative_us)
+
+    # ru_maxrss is in kilobytes on Linux
+    max_rss_kb = next(
+        int(line.split()[1])
+        for line in process.stdout.splitlines()
+        if line.startswith("max_rss ")
+    )
+
+    return {
+        "module": module,
+        "total_ms": round(total_us / 1000, 1),
+        "max_rss_mb": round(max_rss_kb / 1024, 1),
+        "packages_ms": {
+            package: round(us / 1000, 1)
+            for package, us in sorted(
+                packages.items(), key=lambda item: item[1], reverse=True
+            )
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="demodjango.wsgi")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--output", help="Also write the full results to this file")
+    args = parser.parse_args()
+
+    results = measure(args.module)
+
+    print(f"Imported {results['module']} and app.urls in {results['total_ms']} ms")
+    print(f"Peak memory: {results['max_rss_mb']} MB")
+    print()
+    for package, ms in list(results["packages_ms"].items())[: args.top]:
+        print(f"{ms:>10.1f} ms  {package}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
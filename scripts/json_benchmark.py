@@ -0,0 +1,99 @@
+"""Compare the standard and fast JSON renderers used by the views.
+
+Each renderer builds the responses for the api and index?json=true views from a
+pool of threads, so the figures include any contention between requests.
+
+    python scripts/json_benchmark.py
+    python scripts/json_benchmark.py --threads 16 --iterations 20000 --output json.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "demodjango.settings")
+os.environ.setdefault("DJANGO_SECRET_KEY", "json-benchmark")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import override_settings  # noqa: E402
+
+from app import responses  # noqa: E402
+from app.util import CheckResult  # noqa: E402
+
+RESULTS = [
+    CheckResult(
+        f"check_{i}",
+        f"Check number {i}",
+        i % 4 != 0,
+        f"Read sample content from backend {i}" if i % 4 else "Connection refused",
+        round(i * 0.37, 3),
+    )
+    for i in range(12)
+]
+
+SCENARIOS = {
+    "api": lambda: responses.api_response(datetime.now()),
+    "index_json": lambda: responses.check_results_response(RESULTS),
+}
+
+
+def measure(render, threads, iterations):
+    def work(count):
+        for _ in range(count):
+            render().content
+
+    per_thread = iterations // threads
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        start = time.perf_counter()
+        list(executor.map(work, [per_thread] * threads))
+        elapsed = time.perf_counter() - start
+
+    total = per_thread * threads
+    return {
+        "renders_per_second": round(total / elapsed),
+        "microseconds_per_render": round(elapsed / total * 1_000_000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    report = {"threads": args.threads, "iterations": args.iterations, "scenarios": {}}
+    for name, render in SCENARIOS.items():
+        report["scenarios"][name] = {}
+        for renderer, fast in (("standard", False), ("fast", True)):
+            with override_settings(FAST_JSON=fast):
+                measure(render, args.threads, args.iterations // 10)
+                report["scenarios"][name][renderer] = measure(
+                    render, args.threads, args.iterations
+                )
+
+    print(f"{'scenario':<14}{'renderer':<10}{'renders/s':>12}{'µs/render':>12}")
+    for name, renderers in report["scenarios"].items():
+        for renderer, result in renderers.items():
+            print(
+                f"{name:<14}{renderer:<10}{result['renders_per_second']:>12}"
+                f"{result['microseconds_per_render']:>12}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from unittest.mock import Mock
 from unittest.mock import patch
 
@@ -25,7 +27,7 @@ def test_a_successful_single_http_check(patched_requests, definition):
     assert definition == check.report[0].summary
     assert not check.report[0].errors
     assert check.report[0].success
-    patched_requests.get.assert_called_with("https://example.com")
+    patched_requests.get.assert_called_with("https://example.com", timeout=(3.05, 5))
 
 
 @patch("app.check.check_http.requests")
@@ -52,7 +54,7 @@ def test_a_failed_http_check_status_code_mismatch(patched_requests):
     assert not check.success
     assert "https://example.com|200|GET" in check.report[0].summary
     assert "expected HTTP Status 200 but got 400" in check.report[0].errors
-    patched_requests.get.assert_called_with("https://example.com")
+    patched_requests.get.assert_called_with("https://example.com", timeout=(3.05, 5))
 
 
 @pytest.mark.parametrize(
@@ -95,3 +97,95 @@ def test_a_failed_http_check_due_to_exception(patched_requests):
     assert not check.report[0].success
     assert "Fake Exception" in check.report[0].errors
     assert "https://example.com" == check.report[0].summary
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class FakeSession:
+    def __init__(self, status=200, error=None):
+        self.status = status
+        self.error = error
+        self.requests = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url))
+        if self.error:
+            raise self.error
+        return FakeResponse(self.status)
+
+
+@patch("app.check.check_http.requests")
+def test_http_checks_run_in_parallel_and_keep_their_order(patched_requests):
+    def slow_get(url, timeout):
+        time.sleep(0.2)
+        return Mock(status_code=200 if "slow" in url else 404)
+
+    patched_requests.get.side_effect = slow_get
+    definitions = [f"https://example.com/{i}" for i in range(3)]
+
+    check = HTTPCheck(
+        ",".join(["https://example.com/slow"] + definitions),
+        max_workers=4,
+        connect_timeout=1,
+        read_timeout=2,
+    )
+    start = time.monotonic()
+    check.execute()
+
+    assert time.monotonic() - start < 0.6
+    assert ["https://example.com/slow"] + definitions == [
+        r.summary for r in check.report
+    ]
+    assert [True, False, False, False] == [r.success for r in check.report]
+    assert all(r.elapsed >= 0.2 for r in check.report)
+    patched_requests.get.assert_called_with("https://example.com/2", timeout=(1, 2))
+
+
+@patch("aiohttp.ClientSession")
+def test_a_successful_set_of_async_http_checks(patched_session):
+    session = FakeSession(200)
+    patched_session.return_value = session
+
+    check = HTTPCheck(",".join([URL_ONLY, URL_AND_STATUS, URL_STATUS_AND_METHOD]))
+    asyncio.run(check.execute_async())
+
+    assert check.success
+    assert 3 == len(check.report)
+    assert [("GET", "https://example.com")] * 3 == session.requests
+
+
+@patch("aiohttp.ClientSession")
+def test_a_failed_async_http_check_status_code_mismatch(patched_session):
+    patched_session.return_value = FakeSession(400)
+
+    check = HTTPCheck(URL_STATUS_AND_METHOD)
+    asyncio.run(check.execute_async())
+
+    assert not check.success
+    assert "expected HTTP Status 200 but got 400" in check.report[0].errors
+
+
+@patch("aiohttp.ClientSession")
+def test_a_failed_async_http_check_due_to_exception(patched_session):
+    patched_session.return_value = FakeSession(error=Exception("Fake Exception"))
+
+    check = HTTPCheck("https://example.com")
+    asyncio.run(check.execute_async())
+
+    assert not check.success
+    assert "Fake Exception" in check.report[0].errors
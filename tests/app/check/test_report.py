@@ -1,4 +1,6 @@
+from app.check import report
 from app.check.report import CheckReport
+from app.check.report import render_many
 
 
 def test_rendering_a_successful_report():
@@ -24,3 +26,32 @@ def test_rendering_an_unsuccessful_report():
     assert "Report Title: failure" in output
     assert "Something went wrong!" in output
     assert "And something else went wrong!" in output
+
+
+def test_rendering_a_report_with_the_elapsed_time():
+    report = CheckReport(True, "Report Title", [], 0.12345)
+
+    output = report.render()
+
+    assert "Report Title: success in 0.123s\n\n" == output
+
+
+def test_rendering_many_reports_in_one_pass():
+    reports = [
+        CheckReport(True, "First Report", []),
+        CheckReport(False, "Second Report", ["Something went wrong!"], 1.5),
+    ]
+
+    output = render_many(reports)
+
+    assert "".join([report.render() for report in reports]) == output
+
+
+def test_rendering_does_not_depend_on_the_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    report._environment.cache_clear()
+    report._template.cache_clear()
+
+    output = CheckReport(True, "Report Title", []).render()
+
+    assert "Report Title: success\n\n" == output
@@ -2,6 +2,9 @@ import os
 
 import pytest
 
+from app import breaker
+from app.cache import check_cache
+
 
 @pytest.fixture
 def mock_environment():
@@ -15,3 +18,12 @@ def mock_environment():
 
     for key in keys:
         del os.environ[key]
+
+
+@pytest.fixture(autouse=True)
+def clear_check_cache():
+    check_cache.clear()
+    breaker.reset()
+    yield
+    check_cache.clear()
+    breaker.reset()
@@ -0,0 +1,207 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+from django.test import override_settings
+
+from app.checks import GitInformationCheck
+from app.executor import run_checks
+from app.util import Check
+
+
+class FlakyCheck(Check):
+    def __init__(self, test_id="flaky"):
+        super().__init__(test_id, "Flaky")
+        self.calls = 0
+        self.success = False
+
+    def __call__(self):
+        self.calls += 1
+        return [self.result(self.success, "")]
+
+
+class AsyncFlakyCheck(FlakyCheck):
+    async def run(self):
+        self.calls += 1
+        return [self.result(self.success, "")]
+
+
+@pytest.fixture
+def clock():
+    with patch("app.breaker.time.time", return_value=1_700_000_000.0) as time:
+        yield time
+
+
+@override_settings(CHECK_BREAKER_THRESHOLD=3, CHECK_BREAKER_COOLDOWN=30)
+def test_breaker_opens_after_consecutive_failures(clock):
+    check = FlakyCheck()
+
+    for _ in range(3):
+        check()
+    results = check()
+
+    assert 3 == check.calls
+    assert not results[0].success
+    assert "Flaky circuit open since 2023-11-14T22:13:20+00:00" == results[0].message
+
+
+@override_settings(CHECK_BREAKER_THRESHOLD=3)
+def test_a_success_resets_the_failure_count():
+    check = FlakyCheck()
+
+    check()
+    check()
+    check.success = True
+    check()
+    check.success = False
+    check()
+    check()
+    check()
+
+    assert 6 == check.calls
+
+
+@override_settings(CHECK_BREAKER_THRESHOLD=1, CHECK_BREAKER_COOLDOWN=30)
+def test_half_open_breaker_lets_one_trial_through(clock):
+    check = FlakyCheck()
+    check()
+
+    clock.return_value += 31
+    check()
+    check()
+
+    assert 2 == check.calls
+
+    clock.return_value += 31
+    check.success = True
+    check()
+    check()
+
+    assert 4 == check.calls
+
+
+@override_settings(CHECK_BREAKER_THRESHOLD=1)
+def test_open_breaker_skips_async_runs():
+    check = AsyncFlakyCheck()
+
+    asyncio.run(check.run())
+    results = asyncio.run(check.run())
+
+    assert 1 == check.calls
+    assert "circuit open since" in results[0].message
+
+
+@override_settings(CHECK_BREAKER_THRESHOLD=1)
+def test_breaker_can_be_disabled_per_check():
+    check = FlakyCheck()
+    check.breaker_threshold = 0
+
+    check()
+    check()
+
+    assert 2 == check.calls
+
+
+@override_settings(
+    CHECK_BREAKER_THRESHOLD=2, CHECK_BREAKER_COOLDOWN=30, CHECK_BREAKER_REDIS=True
+)
+def test_breaker_state_is_shared_through_redis(clock):
+    with patch("app.breaker.redis_client", return_value=fakeredis.FakeRedis()):
+        # Separate instances stand in for the same check in different workers
+        first, second = FlakyCheck(), FlakyCheck()
+        first()
+        second()
+        first()
+
+        assert 2 == first.calls + second.calls
+
+        clock.return_value += 31
+        second()
+        first()
+
+        assert 3 == first.calls + second.calls
+
+
+class PartlyFailingCheck(FlakyCheck):
+    def __call__(self):
+        self.calls += 1
+        return [self.result(True, "bucket-1"), self.result(self.success, "bucket-2")]
+
+
+@override_settings(CHECK_BREAKER_THRESHOLD=1)
+def test_breaker_stays_closed_while_some_results_succeed():
+    check = PartlyFailingCheck()
+
+    check()
+    results = check()
+
+    assert 2 == check.calls
+    assert ["bucket-1", "bucket-2"] == [result.message for result in results]
+
+
+class RaisingCheck(FlakyCheck):
+    def __call__(self):
+        self.calls += 1
+        raise RuntimeError("Backend unavailable")
+
+
+class HangingCheck(FlakyCheck):
+    def __call__(self):
+        self.calls += 1
+        time.sleep(0.5)
+        return [self.result(True, "")]
+
+
+@override_settings(CHECK_BREAKER_THRESHOLD=1)
+def test_breaker_opens_when_a_check_raises():
+    check = RaisingCheck()
+
+    with pytest.raises(RuntimeError):
+        check()
+    results = check()
+
+    assert 1 == check.calls
+    assert "circuit open since" in results[0].message
+
+
+@override_settings(CHECK_BREAKER_THRESHOLD=1, CHECK_CACHE_TTL=0)
+def test_breaker_opens_when_a_check_times_out():
+    check = HangingCheck()
+    check.timeout = 0.05
+
+    run_checks([check])
+    # The overrun is recorded when the run finishes in the background
+    time.sleep(0.6)
+    results = check()
+
+    assert 1 == check.calls
+    assert "circuit open since" in results[0].message
+
+
+@override_settings(CHECK_BREAKER_THRESHOLD=1)
+def test_local_checks_have_no_breaker():
+    check = GitInformationCheck()
+
+    results = [check()[0] for _ in range(3)]
+
+    assert all("circuit open" not in result.message for result in results)
+
+
+@override_settings(CHECK_BREAKER_THRESHOLD=1, CHECK_BREAKER_REDIS=True)
+def test_shared_breaker_is_read_and_written_off_the_event_loop():
+    loop_thread = threading.current_thread()
+    redis_threads = []
+
+    class ThreadRecordingRedis(fakeredis.FakeRedis):
+        def execute_command(self, *args, **options):
+            redis_threads.append(threading.current_thread())
+            return super().execute_command(*args, **options)
+
+    with patch("app.breaker.redis_client", return_value=ThreadRecordingRedis()):
+        asyncio.run(AsyncFlakyCheck().run())
+
+    assert redis_threads
+    assert loop_thread not in redis_threads
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from django.test import override_settings
+
+from app.cache import CheckResultCache
+from app.util import Check
+
+
+class CountingCheck(Check):
+    def __init__(self, test_id="counting", delay=0):
+        super().__init__(test_id, "Counting")
+        self.calls = 0
+        self.delay = delay
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return [self.result(True, f"call {self.calls}")]
+
+
+@override_settings(CHECK_CACHE_TTL=60)
+def test_fresh_results_are_served_from_the_cache():
+    cache = CheckResultCache()
+    check = CountingCheck()
+
+    first = cache.call(check)
+    second = cache.call(check)
+
+    assert 1 == check.calls
+    assert first[0].cache_age is None
+    assert "call 1" == second[0].message
+    assert second[0].cache_age is not None
+    assert "cache_age" in second[0].to_dict()
+
+
+@override_settings(CHECK_CACHE_TTL=0)
+def test_caching_is_disabled_with_a_zero_ttl():
+    cache = CheckResultCache()
+    check = CountingCheck()
+
+    cache.call(check)
+    cache.call(check)
+
+    assert 2 == check.calls
+
+
+@override_settings(CHECK_CACHE_TTL=60, CHECK_CACHE_TTLS={"counting": 0})
+def test_ttl_can_be_configured_per_check():
+    cache = CheckResultCache()
+    check = CountingCheck()
+
+    cache.call(check)
+    cache.call(check)
+
+    assert 2 == check.calls
+    assert 60 == cache.ttl(CountingCheck("other"))
+
+
+@override_settings(CHECK_CACHE_TTL=1, CHECK_CACHE_STALE_TTL=60)
+def test_stale_results_are_served_while_one_refresh_runs():
+    cache = CheckResultCache()
+    check = CountingCheck(delay=0.2)
+    cache.call(check)
+
+    with patch("app.cache.time.time", return_value=time.time() + 5):
+        stale = [cache.call(check) for _ in range(3)]
+
+    assert all("call 1" == results[0].message for results in stale)
+    time.sleep(0.5)
+    assert 2 == check.calls
+    assert "call 2" == cache.call(check)[0].message
+
+
+@override_settings(CHECK_CACHE_TTL=1, CHECK_CACHE_STALE_TTL=1)
+def test_results_older_than_the_stale_window_are_refreshed_inline():
+    cache = CheckResultCache()
+    check = CountingCheck()
+    cache.call(check)
+
+    with patch("app.cache.time.time", return_value=time.time() + 5):
+        results = cache.call(check)
+
+    assert "call 2" == results[0].message
+    assert results[0].cache_age is None
+
+
+@override_settings(CHECK_CACHE_TTL=60)
+def test_least_recently_used_entries_are_evicted():
+    cache = CheckResultCache(maxsize=2)
+    checks = [CountingCheck(str(i)) for i in range(3)]
+
+    for check in checks:
+        cache.call(check)
+    cache.call(checks[0])
+
+    assert 2 == checks[0].calls
+    assert 1 == checks[2].calls
+
+
+@override_settings(CHECK_CACHE_TTL=60, CHECK_CACHE_REDIS=True)
+def test_shared_cache_is_read_and_written_off_the_event_loop():
+    cache = CheckResultCache()
+    loop_thread = threading.current_thread()
+    redis_threads = []
+
+    def record_thread(*args, **kwargs):
+        redis_threads.append(threading.current_thread())
+
+    redis = Mock(get=Mock(side_effect=record_thread), set=record_thread)
+    with patch("app.cache.redis_client", return_value=redis):
+        asyncio.run(cache.run(CountingCheck()))
+
+    assert 2 == len(redis_threads)
+    assert loop_thread not in redis_threads
@@ -0,0 +1,151 @@
+import io
+import logging
+import time
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
+from celery.exceptions import TimeoutError
+from django.test import override_settings
+
+from app.checks import CeleryWorkerCheck
+from app.checks import S3CrossEnvironmentBucketChecks
+from app.checks import _bucket_reads
+from app.checks import read_from_bucket
+
+logger = logging.getLogger("django")
+
+
+@patch("app.checks.demodjango_task")
+def test_celery_worker_check_waits_for_the_result(patched_task):
+    async_result = Mock(id="task-1", status="SUCCESS", date_done="2024-08-01 12:34")
+    async_result.get.return_value = "demodjango_task queued at 2024-08-01"
+    patched_task.delay.return_value = async_result
+
+    result = CeleryWorkerCheck(logger=logger)()[0]
+
+    assert result.success
+    assert result.message.startswith(
+        "demodjango_task queued at 2024-08-01 with task_id task-1 was processed at "
+        "2024-08-01 12:34 with status SUCCESS in "
+    )
+    assert result.message.endswith(" ms")
+    async_result.get.assert_called_once_with(timeout=2)
+
+
+@patch("app.checks.demodjango_task")
+def test_celery_worker_check_times_out(patched_task):
+    async_result = Mock(id="task-1")
+    async_result.get.side_effect = TimeoutError("The operation timed out.")
+    patched_task.delay.return_value = async_result
+
+    result = CeleryWorkerCheck(logger=logger)()[0]
+
+    assert not result.success
+    assert "task_id task-1 was not processed within 2 seconds" == result.message
+
+
+@patch("app.checks.demodjango_task")
+def test_celery_worker_check_fails_when_the_task_cannot_be_queued(patched_task):
+    patched_task.delay.side_effect = Exception("Connection refused")
+
+    result = CeleryWorkerCheck(logger=logger)()[0]
+
+    assert not result.success
+    assert "Connection refused" == result.message
+
+
+@override_settings(
+    S3_CROSS_ENVIRONMENT_BUCKET_NAMES="bucket-1, bucket-2,bucket-3",
+    S3_CROSS_ENVIRONMENT_MAX_WORKERS=3,
+    S3_CROSS_ENVIRONMENT_PROBE_BYTES=16,
+)
+@patch("app.checks.s3_client")
+def test_cross_environment_buckets_are_probed_concurrently(patched_s3_client):
+    def get_object(Bucket, Key, Range):
+        time.sleep(0.2)
+        if Bucket == "bucket-2":
+            raise Exception("Access Denied")
+        return {"Body": StreamingBody(io.BytesIO(b"Test content"), 12)}
+
+    patched_s3_client.return_value.get_object.side_effect = get_object
+
+    start = time.monotonic()
+    results = S3CrossEnvironmentBucketChecks()()
+
+    assert time.monotonic() - start < 0.5
+    assert [
+        "Cross environment S3 Buckets (bucket-1)",
+        "Cross environment S3 Buckets (bucket-2)",
+        "Cross environment S3 Buckets (bucket-3)",
+    ] == [result.description for result in results]
+    assert [True, False, True] == [result.success for result in results]
+    assert "Test contentBucket: bucket-1" == results[0].message
+    assert "Error reading bucket-2: Access Denied" == results[1].message
+    patched_s3_client.return_value.get_object.assert_called_with(
+        Bucket="bucket-3", Key="sample_file.txt", Range="bytes=0-15"
+    )
+
+
+@override_settings(S3_CROSS_ENVIRONMENT_BUCKET_NAMES="")
+def test_no_cross_environment_buckets():
+    results = S3CrossEnvironmentBucketChecks()()
+
+    assert 1 == len(results)
+    assert results[0].success
+    assert "No cross-environment buckets configured" == results[0].message
+
+
+def body(content: bytes):
+    return StreamingBody(io.BytesIO(content), len(content))
+
+
+@pytest.fixture
+def s3():
+    _bucket_reads.clear()
+    with patch("app.checks.s3_client") as patched_s3_client:
+        yield patched_s3_client.return_value
+    _bucket_reads.clear()
+
+
+@override_settings(S3_READ_MAX_BYTES=8)
+def test_reading_from_a_bucket_is_capped(s3):
+    s3.get_object.return_value = {"Body": body(b"Test content read from S3")}
+
+    assert "Test conBucket: bucket-1" == read_from_bucket("bucket-1")
+    s3.get_object.assert_called_once_with(
+        Bucket="bucket-1", Key="sample_file.txt", Range="bytes=0-7"
+    )
+
+
+def test_reading_a_partial_character_from_a_bucket(s3):
+    s3.get_object.return_value = {"Body": body("Tést".encode())}
+
+    assert "T\ufffdBucket: bucket-1" == read_from_bucket("bucket-1", max_bytes=2)
+
+
+@override_settings(S3_CONDITIONAL_READS=True)
+def test_an_unchanged_object_is_not_downloaded_again(s3):
+    s3.get_object.side_effect = [
+        {"Body": body(b"Test content"), "ETag": '"abc"'},
+        ClientError({"Error": {"Code": "304"}}, "GetObject"),
+    ]
+
+    assert "Test contentBucket: bucket-1" == read_from_bucket("bucket-1")
+    assert "Test contentBucket: bucket-1" == read_from_bucket("bucket-1")
+    assert '"abc"' == s3.get_object.call_args.kwargs["IfNoneMatch"]
+
+
+@override_settings(S3_CONDITIONAL_READS=False)
+def test_conditional_reads_can_be_disabled(s3):
+    s3.get_object.side_effect = [
+        {"Body": body(b"Test content"), "ETag": '"abc"'},
+        {"Body": body(b"New content"), "ETag": '"def"'},
+    ]
+
+    read_from_bucket("bucket-1")
+
+    assert "New contentBucket: bucket-1" == read_from_bucket("bucket-1")
+    assert "IfNoneMatch" not in s3.get_object.call_args.kwargs
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+
+import pytest
+from django.test import override_settings
+
+from app import clients
+
+
+@pytest.fixture(autouse=True)
+def reset_clients():
+    clients.reset()
+    yield
+    clients.reset()
+
+
+@override_settings(REDIS_ENDPOINT="redis://localhost:6379")
+def test_clients_are_reused():
+    assert clients.redis_client() is clients.redis_client()
+    assert clients.s3_client() is clients.s3_client()
+    assert clients.http_session() is clients.http_session()
+
+
+def test_clients_are_keyed_by_endpoint():
+    with override_settings(OPENSEARCH_ENDPOINT="http://one:9200"):
+        first = clients.opensearch_client()
+    with override_settings(OPENSEARCH_ENDPOINT="http://two:9200"):
+        second = clients.opensearch_client()
+
+    assert first is not second
+
+
+def test_clients_are_rebuilt_in_a_forked_worker():
+    session = clients.http_session()
+
+    clients._reset_after_fork()
+
+    assert session is not clients.http_session()
+
+
+@override_settings(
+    REDIS_ENDPOINT="redis://localhost:6379",
+    REDIS_CONNECT_TIMEOUT=1.5,
+    REDIS_TIMEOUT=0.5,
+)
+def test_redis_client_has_timeouts():
+    kwargs = clients.redis_client().connection_pool.connection_kwargs
+
+    assert 1.5 == kwargs["socket_connect_timeout"]
+    assert 0.5 == kwargs["socket_timeout"]
+
+
+@override_settings(REDIS_ENDPOINT="redis://localhost:6379")
+def test_async_clients_are_reused_within_an_event_loop():
+    async def get_clients():
+        return (
+            clients.async_redis_client(),
+            clients.aiohttp_session(),
+            clients.async_redis_client(),
+            clients.aiohttp_session(),
+        )
+
+    async def first_loop():
+        redis, session, same_redis, same_session = await get_clients()
+        assert redis is same_redis
+        assert session is same_session
+        await session.close()
+        return redis
+
+    async def second_loop():
+        redis, session, _, _ = await get_clients()
+        await session.close()
+        return redis
+
+    assert asyncio.run(first_loop()) is not asyncio.run(second_loop())
+
+
+def test_http_session_does_not_keep_cookies():
+    cookies_sent = []
+
+    class SetCookieHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            cookies_sent.append(self.headers.get("Cookie"))
+            self.send_response(200)
+            self.send_header("Set-Cookie", "session=abc; Path=/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), SetCookieHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/"
+        clients.http_session().get(url)
+        clients.http_session().get(url)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [None, None] == cookies_sent
+
+
+def test_s3_client_does_not_retry():
+    assert 1 == clients.s3_client().meta.config.retries["total_max_attempts"]
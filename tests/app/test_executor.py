@@ -0,0 +1,205 @@
+import asyncio
+import threading
+import time
+
+from django.conf import settings
+from django.test import override_settings
+
+from app import breaker
+from app import executor
+from app.executor import iter_checks
+from app.executor import run_checks
+from app.executor import run_checks_async
+from app.util import Check
+
+
+class SleepyCheck(Check):
+    def __init__(self, test_id, delay):
+        super().__init__(test_id, f"Sleepy {test_id}")
+        self.delay = delay
+
+    def __call__(self):
+        time.sleep(self.delay)
+        return [self.result(True, f"slept {self.delay}")]
+
+
+class BrokenCheck(Check):
+    def __init__(self):
+        super().__init__("broken", "Broken")
+
+    def __call__(self):
+        raise Exception("Something went wrong!")
+
+
+def test_results_are_returned_in_check_order():
+    checks = [SleepyCheck("one", 0.2), SleepyCheck("two", 0), SleepyCheck("three", 0.1)]
+
+    results = run_checks(checks, check_timeout=5, page_timeout=5)
+
+    assert ["one", "two", "three"] == [r.test_id for r in results]
+    assert all(r.success for r in results)
+
+
+def test_checks_run_concurrently():
+    checks = [SleepyCheck(str(i), 0.2) for i in range(5)]
+
+    start = time.monotonic()
+    run_checks(checks, check_timeout=5, page_timeout=5, max_workers=5)
+
+    assert time.monotonic() - start < 0.6
+
+
+def test_a_slow_check_times_out():
+    checks = [SleepyCheck("slow", 2), SleepyCheck("fast", 0)]
+
+    start = time.monotonic()
+    results = run_checks(checks, check_timeout=0.2, page_timeout=5)
+
+    assert time.monotonic() - start < 1
+    assert not results[0].success
+    assert "Sleepy slow timed out after 0.2 seconds" == results[0].message
+    assert results[1].success
+
+
+def test_the_page_deadline_applies_to_queued_checks():
+    checks = [SleepyCheck("first", 0.3), SleepyCheck("queued", 0.3)]
+
+    results = run_checks(checks, check_timeout=5, page_timeout=0.4, max_workers=1)
+
+    assert results[0].success
+    assert not results[1].success
+    assert "timed out after 0.4 seconds" in results[1].message
+
+
+def test_an_exception_becomes_a_failed_result():
+    results = run_checks([BrokenCheck()], check_timeout=5, page_timeout=5)
+
+    assert 1 == len(results)
+    assert not results[0].success
+    assert "Something went wrong!" == results[0].message
+
+
+class AsyncSleepyCheck(SleepyCheck):
+    async def run(self):
+        await asyncio.sleep(self.delay)
+        return [self.result(True, f"slept {self.delay}")]
+
+
+def test_async_results_are_returned_in_check_order():
+    checks = [AsyncSleepyCheck("one", 0.2), SleepyCheck("two", 0), BrokenCheck()]
+
+    results = asyncio.run(run_checks_async(checks, check_timeout=5, page_timeout=5))
+
+    assert ["one", "two", "broken"] == [r.test_id for r in results]
+    assert [True, True, False] == [r.success for r in results]
+
+
+def test_async_slow_check_times_out():
+    checks = [AsyncSleepyCheck("slow", 2), AsyncSleepyCheck("fast", 0)]
+
+    start = time.monotonic()
+    results = asyncio.run(run_checks_async(checks, check_timeout=0.2, page_timeout=5))
+
+    assert time.monotonic() - start < 1
+    assert "Sleepy slow timed out after 0.2 seconds" == results[0].message
+    assert results[1].success
+
+
+def test_results_are_yielded_as_checks_finish():
+    checks = [SleepyCheck("slow", 0.3), SleepyCheck("fast", 0)]
+
+    finished = [
+        (index, results[0].test_id)
+        for index, results in iter_checks(checks, check_timeout=5, page_timeout=5)
+    ]
+
+    assert [(1, "fast"), (0, "slow")] == finished
+
+
+def test_a_check_can_set_its_own_timeout():
+    slow = SleepyCheck("slow", 2)
+    slow.timeout = 0.2
+
+    results = run_checks([slow], check_timeout=5, page_timeout=5)
+
+    assert "Sleepy slow timed out after 0.2 seconds" == results[0].message
+
+
+def test_checks_in_a_concurrency_group_run_one_at_a_time():
+    checks = [SleepyCheck(str(i), 0.2) for i in range(3)]
+    for check in checks:
+        check.concurrency_group = "database"
+
+    start = time.monotonic()
+    results = run_checks(checks, check_timeout=5, page_timeout=5, max_workers=3)
+
+    assert time.monotonic() - start >= 0.6
+    assert all(r.success for r in results)
+
+
+def test_checks_in_a_concurrency_group_run_one_at_a_time_async():
+    checks = [SleepyCheck(str(i), 0.2) for i in range(3)]
+    for check in checks:
+        check.concurrency_group = "database"
+
+    start = time.monotonic()
+    results = asyncio.run(run_checks_async(checks, check_timeout=5, page_timeout=5))
+
+    assert time.monotonic() - start >= 0.6
+    assert all(r.success for r in results)
+
+
+class ThreadRecordingCheck(SleepyCheck):
+    def __init__(self, test_id, threads):
+        super().__init__(test_id, 0)
+        self.threads = threads
+
+    def __call__(self):
+        self.threads.add(threading.current_thread())
+        return super().__call__()
+
+
+@override_settings(CHECK_CACHE_TTL=0)
+def test_pages_share_one_bounded_pool():
+    threads = set()
+
+    for _ in range(3):
+        run_checks(
+            [ThreadRecordingCheck(str(i), threads) for i in range(4)],
+            check_timeout=5,
+            page_timeout=5,
+        )
+
+    assert threads
+    assert len(threads) <= settings.CHECK_MAX_WORKERS
+    assert threads <= set(executor._get_executor()._threads)
+
+
+def test_the_pool_is_recreated_after_a_fork():
+    pool = executor._get_executor()
+
+    executor._reset_after_fork()
+
+    assert pool is not executor._get_executor()
+
+
+@override_settings(CHECK_BREAKER_THRESHOLD=4, CHECK_CACHE_TTL=0)
+def test_a_timed_out_run_counts_as_one_breaker_failure():
+    slow = SleepyCheck("overrun", 0.3)
+    slow.timeout = 0.05
+
+    results = run_checks([slow], check_timeout=5, page_timeout=5)
+    time.sleep(0.5)
+
+    assert "Sleepy overrun timed out after 0.05 seconds" == results[0].message
+    assert 1 == breaker._failures["overrun"]
+
+
+@override_settings(CHECK_BREAKER_THRESHOLD=1, CHECK_CACHE_TTL=0)
+def test_a_shorter_page_deadline_does_not_count_against_the_breaker():
+    slow = SleepyCheck("short_deadline", 0.3)
+
+    run_checks([slow], check_timeout=0.05, page_timeout=0.05)
+    time.sleep(0.5)
+
+    assert "short_deadline" not in breaker._failures
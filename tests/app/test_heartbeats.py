@@ -0,0 +1,93 @@
+from datetime import timedelta
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from app.checks import CeleryBeatCheck
+from app.heartbeats import flush_heartbeats
+from app.heartbeats import latest_heartbeat
+from app.heartbeats import record_heartbeat
+from app.models import ScheduledTask
+from celery_worker.tasks import demodjango_scheduled_task
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value.encode()
+
+    def rpush(self, key, value):
+        self.data.setdefault(key, []).append(value.encode())
+
+    def lrange(self, key, start, end):
+        return self.data.get(key, [])[start : end + 1]
+
+    def ltrim(self, key, start, end):
+        self.data[key] = self.data.get(key, [])[start:]
+
+    def pipeline(self):
+        pipeline = Mock(wraps=self)
+        pipeline.execute = Mock()
+        return pipeline
+
+
+@pytest.fixture
+def fake_redis():
+    fake = FakeRedis()
+    with patch("app.heartbeats.redis_client", return_value=fake):
+        yield fake
+
+
+def test_the_latest_heartbeat_is_read_back(fake_redis):
+    timestamp = timezone.now()
+    record_heartbeat("task-1", timestamp - timedelta(seconds=30))
+    record_heartbeat("task-2", timestamp)
+
+    assert latest_heartbeat() == {"taskid": "task-2", "timestamp": timestamp}
+
+
+def test_there_is_no_heartbeat_until_one_is_recorded(fake_redis):
+    assert latest_heartbeat() is None
+
+
+@pytest.mark.django_db
+@override_settings(HEARTBEAT_FLUSH_BATCH_SIZE=2)
+def test_buffered_heartbeats_are_flushed_in_batches(fake_redis):
+    timestamp = timezone.now()
+    for i in range(5):
+        record_heartbeat(f"task-{i}", timestamp + timedelta(seconds=i))
+
+    assert flush_heartbeats() == 5
+    assert flush_heartbeats() == 0
+    assert ScheduledTask.objects.count() == 5
+    assert ScheduledTask.objects.latest().taskid == "task-4"
+
+
+@pytest.mark.django_db
+@override_settings(HEARTBEAT_BUFFERING=True)
+def test_the_scheduled_task_buffers_heartbeats(fake_redis):
+    demodjango_scheduled_task.apply(task_id="task-1")
+
+    assert latest_heartbeat()["taskid"] == "task-1"
+    assert ScheduledTask.objects.count() == 0
+
+
+@override_settings(HEARTBEAT_BUFFERING=True)
+def test_celery_beat_check_reads_the_latest_heartbeat(fake_redis):
+    timestamp = timezone.now()
+    record_heartbeat("task-1", timestamp)
+
+    result = CeleryBeatCheck()()[0]
+
+    assert result.success
+    assert result.message == (
+        f"Latest task scheduled with task_id task-1 at {timestamp}"
+    )
@@ -0,0 +1,20 @@
+import subprocess
+import sys
+
+PROGRAM = """
+import sys
+import django
+
+django.setup()
+import app.urls
+
+print(",".join(sorted(m for m in ("aiohttp", "boto3", "bs4", "opensearchpy", "redis") if m in sys.modules)))
+"""
+
+
+def test_backend_clients_are_not_imported_with_the_views():
+    process = subprocess.run(
+        [sys.executable, "-c", PROGRAM], capture_output=True, text=True, check=True
+    )
+
+    assert process.stdout.splitlines()[0] == ""
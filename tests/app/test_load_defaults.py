@@ -0,0 +1,133 @@
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from boto3.exceptions import S3UploadFailedError
+from botocore.exceptions import ClientError
+from django.core.management import CommandError
+from django.core.management import call_command
+from django.test import override_settings
+
+from app.management.commands.load_defaults import FINGERPRINT_KEY
+from app.management.commands.load_defaults import seed_fingerprint
+
+SEED_SETTINGS = dict(
+    RDS_POSTGRES_CREDENTIALS="",
+    REDIS_ENDPOINT="",
+    S3_BUCKET_NAME="bucket-a",
+    ADDITIONAL_S3_BUCKET_NAME="bucket-b",
+    S3_CROSS_ENVIRONMENT_BUCKET_NAMES="bucket-c, bucket-d",
+    OPENSEARCH_ENDPOINT="",
+)
+
+
+def head_object(current_buckets):
+    def head(Bucket, Key):
+        if Bucket in current_buckets:
+            return {"Metadata": {FINGERPRINT_KEY: seed_fingerprint()}}
+        raise ClientError(
+            {"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject"
+        )
+
+    return head
+
+
+def test_seed_fingerprint_changes_with_the_seed_content():
+    fingerprint = seed_fingerprint()
+
+    with patch("app.management.commands.load_defaults.REDIS_SEED", "Different content"):
+        assert seed_fingerprint() != fingerprint
+
+    assert seed_fingerprint() == fingerprint
+
+
+@override_settings(**SEED_SETTINGS)
+@patch("app.management.commands.load_defaults.s3_client")
+def test_load_defaults_seeds_every_bucket_and_reports_timings(patched_client):
+    client = patched_client.return_value
+    client.head_object.side_effect = head_object([])
+    out = StringIO()
+
+    call_command("load_defaults", stdout=out)
+
+    uploaded = sorted(call.args[1] for call in client.upload_file.call_args_list)
+    assert uploaded == ["bucket-a", "bucket-b", "bucket-c", "bucket-d"]
+    assert client.upload_file.call_args.kwargs["ExtraArgs"] == {
+        "Metadata": {FINGERPRINT_KEY: seed_fingerprint()}
+    }
+    for bucket in uploaded:
+        assert f"Seeded S3 bucket {bucket} in " in out.getvalue()
+
+
+@override_settings(**SEED_SETTINGS)
+@patch("app.management.commands.load_defaults.s3_client")
+def test_load_defaults_skips_buckets_with_a_matching_fingerprint(patched_client):
+    client = patched_client.return_value
+    client.head_object.side_effect = head_object(["bucket-a", "bucket-c"])
+    out = StringIO()
+
+    call_command("load_defaults", stdout=out)
+
+    uploaded = sorted(call.args[1] for call in client.upload_file.call_args_list)
+    assert uploaded == ["bucket-b", "bucket-d"]
+    assert "S3 bucket bucket-a is up to date" in out.getvalue()
+
+
+@override_settings(**{**SEED_SETTINGS, "REDIS_ENDPOINT": "redis://localhost"})
+@patch("app.management.commands.load_defaults.s3_client")
+@patch("app.management.commands.load_defaults.redis_client")
+def test_load_defaults_check_only_reports_stale_backends_without_writing(
+    patched_redis, patched_client
+):
+    patched_redis.return_value.get.return_value = seed_fingerprint().encode()
+    patched_client.return_value.head_object.side_effect = head_object(["bucket-a"])
+    out = StringIO()
+
+    with pytest.raises(CommandError) as e:
+        call_command("load_defaults", "--check-only", stdout=out)
+
+    assert str(e.value) == (
+        "Seed data is out of date for S3 bucket bucket-b, S3 bucket bucket-c, "
+        "S3 bucket bucket-d"
+    )
+    assert "redis is up to date" in out.getvalue()
+    patched_redis.return_value.pipeline.assert_not_called()
+    patched_client.return_value.upload_file.assert_not_called()
+
+
+@override_settings(**{**SEED_SETTINGS, "REDIS_ENDPOINT": "redis://localhost"})
+@patch("app.management.commands.load_defaults.s3_client")
+@patch("app.management.commands.load_defaults.redis_client")
+def test_load_defaults_raises_after_seeding_the_other_targets(
+    patched_redis, patched_client
+):
+    patched_redis.return_value.get.side_effect = ConnectionError("Redis is down")
+    patched_client.return_value.head_object.side_effect = head_object([])
+    err = StringIO()
+
+    with pytest.raises(ConnectionError):
+        call_command("load_defaults", stdout=StringIO(), stderr=err)
+
+    assert "Failed to seed redis: Redis is down" in err.getvalue()
+    assert patched_client.return_value.upload_file.call_count == 4
+
+
+@override_settings(**SEED_SETTINGS)
+@patch("app.management.commands.load_defaults.s3_client")
+def test_load_defaults_succeeds_when_a_cross_environment_upload_is_denied(
+    patched_client,
+):
+    def upload_file(filename, bucket, key, **kwargs):
+        if bucket == "bucket-c":
+            raise S3UploadFailedError("Access Denied")
+
+    patched_client.return_value.head_object.side_effect = head_object([])
+    patched_client.return_value.upload_file.side_effect = upload_file
+    out, err = StringIO(), StringIO()
+
+    # Raising here would give the command a non-zero exit status
+    call_command("load_defaults", stdout=out, stderr=err)
+
+    assert "Failed to seed S3 bucket bucket-c: Access Denied" in err.getvalue()
+    assert "Seeded S3 bucket bucket-c" not in out.getvalue()
+    assert "Seeded S3 bucket bucket-d" in out.getvalue()
@@ -0,0 +1,77 @@
+import logging
+import threading
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+from django.test import override_settings
+
+from app import logqueue
+from app.util import CheckResult
+from app.util import render_connection_info
+from app.views import log_landing_page_request
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.written = []
+
+    def emit(self, record):
+        self.written.append((self.format(record), threading.current_thread()))
+
+
+class ThreadFilter(logging.Filter):
+    def filter(self, record):
+        record.thread_seen = threading.current_thread().name
+        return True
+
+
+@pytest.fixture
+def queued_logger():
+    handler = RecordingHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s %(thread_seen)s"))
+    handler.addFilter(ThreadFilter())
+    logger = logging.getLogger("tests.logqueue")
+    logger.propagate = False
+    logger.addHandler(handler)
+
+    logqueue.enqueue_handlers(["tests.logqueue"])
+    yield logger, handler
+
+    logqueue._stop_listeners()
+    logger.handlers.clear()
+
+
+def test_records_are_written_from_a_background_thread(queued_logger):
+    logger, handler = queued_logger
+
+    logger.warning("Queued %s", "message")
+    logqueue._stop_listeners()
+
+    message, thread = handler.written[0]
+    assert f"WARNING Queued message {threading.current_thread().name}" == message
+    assert thread is not threading.current_thread()
+
+
+@override_settings(LOG_RESULT_SAMPLE_RATE=0)
+def test_successful_result_logs_can_be_sampled_out(caplog):
+    caplog.set_level(logging.INFO, logger="django")
+
+    render_connection_info(CheckResult("one", "First", True))
+    render_connection_info(CheckResult("two", "Second", False, "Boom"))
+
+    assert ["Rendering Second stuff  failed with error: Boom"] == [
+        record.getMessage() for record in caplog.records
+    ]
+
+
+def test_request_is_not_logged_when_info_is_disabled():
+    request = Mock()
+
+    with patch("app.views.logger") as logger:
+        logger.isEnabledFor.return_value = False
+        log_landing_page_request(request)
+
+    logger.info.assert_not_called()
+    assert not request.mock_calls
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+from django.test import override_settings
+
+from app import metrics
+from app.util import Check
+
+
+class PassingCheck(Check):
+    def __init__(self):
+        super().__init__("passing", "Passing")
+
+    def __call__(self):
+        return [self.result(True, "")]
+
+
+class FailingCheck(Check):
+    def __init__(self):
+        super().__init__("failing", "Failing")
+
+    def __call__(self):
+        return [self.result(True, ""), self.result(False, "Something went wrong!")]
+
+
+class AsyncCheck(PassingCheck):
+    async def run(self):
+        return await super().run()
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_every_check_call_is_recorded():
+    PassingCheck()()
+    PassingCheck()()
+    FailingCheck()()
+
+    collected = metrics.collect()
+
+    assert 2 == collected["passing"]["calls"]
+    assert 0 == collected["passing"]["failures"]
+    assert 2 == len(collected["passing"]["latencies"])
+    assert 1 == collected["failing"]["calls"]
+    assert 1 == collected["failing"]["failures"]
+
+
+def test_an_async_run_is_only_recorded_once():
+    asyncio.run(AsyncCheck().run())
+
+    assert 1 == metrics.collect()["passing"]["calls"]
+
+
+def test_quantiles():
+    samples = [float(i) for i in range(1, 101)]
+
+    assert 51 == metrics.quantile(samples, 0.5)
+    assert 100 == metrics.quantile(samples, 0.99)
+
+
+def test_metrics_endpoint_renders_prometheus_text(client):
+    FailingCheck()()
+
+    response = client.get("/metrics")
+    content = response.content.decode()
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert 'demodjango_check_calls_total{test_id="failing"} 1' in content
+    assert 'demodjango_check_failures_total{test_id="failing"} 1' in content
+    assert (
+        'demodjango_check_latency_seconds{test_id="failing",quantile="0.5"}' in content
+    )
+    assert 'demodjango_check_latency_seconds_count{test_id="failing"} 1' in content
+
+
+@override_settings(CHECK_METRICS_REDIS=True)
+def test_shared_metrics_are_recorded_off_the_event_loop():
+    loop_thread = threading.current_thread()
+    redis_threads = []
+
+    def pipeline(**kwargs):
+        redis_threads.append(threading.current_thread())
+        return Mock()
+
+    with patch("app.metrics.redis_client", return_value=Mock(pipeline=pipeline)):
+        asyncio.run(AsyncCheck().run())
+
+    assert redis_threads
+    assert loop_thread not in redis_threads
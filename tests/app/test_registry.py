@@ -0,0 +1,73 @@
+from django.test import override_settings
+
+from app.registry import active_checks
+from app.registry import active_optional_checks
+from app.registry import live_checks
+from app.registry import registered_checks
+from app.registry import select_checks
+from app.registry import snapshot_checks
+
+
+def test_every_check_is_registered_once():
+    test_ids = [check.test_id for check in registered_checks()]
+
+    assert len(test_ids) == len(set(test_ids))
+    assert ["git_information", "server_time"] == test_ids[:2]
+    assert "s3_cross_environment" in test_ids
+
+
+def test_checks_keep_the_landing_page_order():
+    assert [
+        "git_information",
+        "server_time",
+        "beat",
+        "celery",
+        "http",
+        "opensearch",
+        "postgres_rds",
+        "private_submodule",
+        "read_write",
+        "redis",
+        "s3",
+        "s3_additional",
+        "s3_static",
+        "s3_cross_environment",
+    ] == [check.test_id for check in registered_checks()]
+
+
+@override_settings(ACTIVE_CHECKS=["redis"])
+def test_mandatory_checks_are_always_active():
+    assert ["git_information", "server_time", "redis"] == [
+        check.test_id for check in active_checks()
+    ]
+    assert ["redis"] == [check.test_id for check in active_optional_checks()]
+
+
+@override_settings(ACTIVE_CHECKS=["celery", "redis"])
+def test_the_celery_worker_check_is_left_out_of_snapshots():
+    assert ["redis"] == [check.test_id for check in snapshot_checks()]
+    assert ["git_information", "server_time", "celery"] == [
+        check.test_id for check in live_checks()
+    ]
+
+
+def test_the_active_checks_are_resolved_once():
+    with override_settings(ACTIVE_CHECKS=["redis"]):
+        assert active_checks() is active_checks()
+
+    assert len(active_checks()) == len(registered_checks())
+
+
+def test_checks_can_be_selected_by_test_id_and_tag():
+    checks = registered_checks()
+
+    assert ["redis", "s3"] == [
+        check.test_id for check in select_checks(checks, test_ids=["redis", "s3"])
+    ]
+    assert {"s3", "s3_additional", "s3_static", "s3_cross_environment"} == {
+        check.test_id for check in select_checks(checks, tags=["storage"])
+    }
+    assert ["s3"] == [
+        check.test_id
+        for check in select_checks(checks, test_ids=["s3", "redis"], tags=["storage"])
+    ]
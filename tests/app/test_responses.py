@@ -0,0 +1,48 @@
+import json
+from datetime import datetime
+
+import pytest
+from django.test import override_settings
+
+from app import responses
+from app.util import CheckResult
+
+RESULTS = [
+    CheckResult("server_time", "Server Time", True, "2024-08-01 12:34:56"),
+    CheckResult("redis", "Redis", False, 'Connection "refused"', 1.5),
+]
+
+
+def render(response):
+    return response.status_code, response["Content-Type"], json.loads(response.content)
+
+
+@pytest.mark.parametrize(
+    "respond",
+    [
+        lambda: responses.json_response({"message": "Hello"}, status=404),
+        lambda: responses.success_response(),
+        lambda: responses.api_response(datetime(2024, 8, 1, 12, 34, 56, 789)),
+        lambda: responses.check_results_response(RESULTS, status=503),
+        lambda: responses.check_results_response([]),
+    ],
+)
+def test_fast_json_matches_the_standard_encoder(respond):
+    with override_settings(FAST_JSON=False):
+        expected = render(respond())
+    with override_settings(FAST_JSON=True):
+        actual = render(respond())
+
+    assert expected == actual
+
+
+def test_fast_json_check_result_lines_match_the_standard_encoder():
+    with override_settings(FAST_JSON=False):
+        expected = [responses.check_result_line(result) for result in RESULTS]
+    with override_settings(FAST_JSON=True):
+        actual = [responses.check_result_line(result) for result in RESULTS]
+
+    assert [json.loads(line) for line in expected] == [
+        json.loads(line) for line in actual
+    ]
+    assert all(line.endswith(b"\n") for line in actual)
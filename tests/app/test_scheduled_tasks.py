@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from app.checks import CeleryBeatCheck
+from app.models import ScheduledTask
+from celery_worker.tasks import purge_scheduled_tasks
+
+
+def create_task(taskid, age):
+    return ScheduledTask.objects.create(taskid=taskid, timestamp=timezone.now() - age)
+
+
+@pytest.mark.django_db
+@override_settings(SCHEDULED_TASK_RETENTION_DAYS=1, SCHEDULED_TASK_PURGE_BATCH_SIZE=2)
+def test_purge_scheduled_tasks_deletes_expired_rows_in_batches():
+    for i in range(5):
+        create_task(f"expired-{i}", timedelta(days=2, minutes=i))
+    create_task("recent", timedelta(hours=1))
+
+    assert purge_scheduled_tasks() == "purge_scheduled_tasks deleted 5 rows"
+    assert list(ScheduledTask.objects.values_list("taskid", flat=True)) == ["recent"]
+
+
+@pytest.mark.django_db
+def test_celery_beat_check_reports_the_latest_task(mock_environment):
+    mock_environment("RDS_POSTGRES_CREDENTIALS", "{}")
+    create_task("older", timedelta(minutes=1))
+    latest = create_task("latest", timedelta(seconds=1))
+
+    result = CeleryBeatCheck()()[0]
+
+    assert result.success
+    assert result.message == (
+        f"Latest task scheduled with task_id latest at {latest.timestamp}"
+    )
+
+
+@pytest.mark.django_db
+def test_celery_beat_check_fails_when_no_task_has_run(mock_environment):
+    mock_environment("RDS_POSTGRES_CREDENTIALS", "{}")
+
+    result = CeleryBeatCheck()()[0]
+
+    assert not result.success
+    assert result.message == "ScheduledTask matching query does not exist."
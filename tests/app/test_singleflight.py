@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+from django.test import override_settings
+
+from app.singleflight import SingleFlight
+from app.util import Check
+
+
+class SlowCheck(Check):
+    def __init__(self, test_id="slow", delay=0.2):
+        super().__init__(test_id, "Slow")
+        self.calls = 0
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return [self.result(True, f"call {self.calls}")]
+
+
+class AsyncSlowCheck(SlowCheck):
+    async def run(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return [self.result(True, f"call {self.calls}")]
+
+
+class BrokenCheck(SlowCheck):
+    def __call__(self):
+        super().__call__()
+        raise RuntimeError("Backend unavailable")
+
+
+def call_concurrently(call, check, callers=10):
+    # Callers start together, so none arrives after the shared run has finished
+    barrier = threading.Barrier(callers)
+
+    def call_together():
+        barrier.wait()
+        return call(check)
+
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        futures = [executor.submit(call_together) for _ in range(callers)]
+        return [future.result() for future in futures]
+
+
+def test_concurrent_calls_share_one_run():
+    check = SlowCheck()
+
+    results = call_concurrently(SingleFlight().call, check)
+
+    assert 1 == check.calls
+    assert all("call 1" == result[0].message for result in results)
+
+
+@override_settings(CHECK_TIMEOUT=0.1)
+def test_callers_that_outwait_the_timeout_do_not_start_another_run():
+    check = SlowCheck(delay=0.5)
+
+    results = call_concurrently(SingleFlight().call, check, callers=20)
+
+    assert 1 == check.calls
+    assert 19 == sum(
+        "Slow timed out after 0.1 seconds" == result[0].message for result in results
+    )
+
+
+@override_settings(CHECK_TIMEOUT=0.1, CHECK_SINGLEFLIGHT_REDIS=True)
+def test_workers_that_outwait_the_timeout_do_not_start_another_run():
+    workers = [SingleFlight() for _ in range(5)]
+    check = SlowCheck(delay=0.5)
+
+    with patch("app.singleflight.redis_client", return_value=fakeredis.FakeRedis()):
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(worker.call, check) for worker in workers]
+            results = [future.result() for future in futures]
+
+    assert 1 == check.calls
+    assert 4 == sum(not result[0].success for result in results)
+
+
+def test_calls_after_a_run_finishes_run_the_check_again():
+    flight = SingleFlight()
+    check = SlowCheck(delay=0)
+
+    flight.call(check)
+    flight.call(check)
+
+    assert 2 == check.calls
+
+
+def test_waiting_callers_get_the_error_from_the_shared_run():
+    check = BrokenCheck()
+
+    with pytest.raises(RuntimeError, match="Backend unavailable"):
+        call_concurrently(SingleFlight().call, check)
+
+    assert 1 == check.calls
+
+
+def test_concurrent_async_runs_share_one_run():
+    flight = SingleFlight()
+    check = AsyncSlowCheck()
+
+    async def run_all():
+        return await asyncio.gather(*[flight.run(check) for _ in range(10)])
+
+    results = asyncio.run(run_all())
+
+    assert 1 == check.calls
+    assert all("call 1" == result[0].message for result in results)
+
+
+@override_settings(CHECK_SINGLEFLIGHT_REDIS=True)
+def test_workers_share_one_run_through_redis():
+    # Separate instances stand in for different gunicorn workers
+    workers = [SingleFlight() for _ in range(5)]
+    check = SlowCheck()
+
+    with patch("app.singleflight.redis_client", return_value=fakeredis.FakeRedis()):
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(worker.call, check) for worker in workers]
+            results = [future.result() for future in futures]
+
+    assert 1 == check.calls
+    assert all("call 1" == result[0].message for result in results)
@@ -0,0 +1,80 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from django.test import override_settings
+
+from app.snapshot import load_snapshot
+from app.snapshot import save_snapshot
+from app.util import CheckResult
+from celery_worker.tasks import run_landing_page_checks
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+@pytest.fixture
+def fake_redis():
+    fake = FakeRedis()
+    with patch("app.snapshot.redis_client", return_value=fake):
+        yield fake
+
+
+def test_a_saved_snapshot_can_be_loaded(fake_redis):
+    save_snapshot([CheckResult("redis", "Redis", True, "Test content")])
+
+    results = load_snapshot()
+
+    assert 1 == len(results)
+    assert "redis" == results[0].test_id
+    assert results[0].success
+    assert "Test content" == results[0].message
+    assert results[0].cache_age is not None
+
+
+def test_there_is_no_snapshot_until_one_is_saved(fake_redis):
+    assert load_snapshot() is None
+
+
+@override_settings(CHECK_SNAPSHOT_MAX_AGE=10)
+def test_an_old_snapshot_is_ignored(fake_redis):
+    save_snapshot([CheckResult("redis", "Redis", True)])
+
+    with patch("app.snapshot.time.time", return_value=time.time() + 60):
+        assert load_snapshot() is None
+
+
+def test_an_unavailable_redis_means_no_snapshot():
+    with patch(
+        "app.snapshot.redis_client", side_effect=Exception("Connection refused")
+    ):
+        assert load_snapshot() is None
+
+
+@override_settings(ACTIVE_CHECKS=["read_write"])
+def test_the_scheduled_task_saves_a_snapshot_of_the_optional_checks(fake_redis):
+    run_landing_page_checks()
+
+    results = load_snapshot()
+
+    assert ["read_write"] == [result.test_id for result in results]
+    assert results[0].success
+
+
+@override_settings(ACTIVE_CHECKS=["celery", "read_write"])
+@patch("app.checks.demodjango_task")
+def test_the_scheduled_task_leaves_out_the_celery_worker_check(
+    patched_task, fake_redis
+):
+    run_landing_page_checks()
+
+    assert ["read_write"] == [result.test_id for result in load_snapshot()]
+    patched_task.delay.assert_not_called()
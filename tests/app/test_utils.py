@@ -1,7 +1,12 @@
+import dataclasses
+
+import orjson
 import pytest
 
 from app.util import Check
 from app.util import CheckResult
+from app.util import dumps
+from app.util import results_from_json
 
 
 def test_check():
@@ -54,6 +59,7 @@ def test_check_result_to_dict():
         "description": "the_description",
         "success": False,
         "message": "",
+        "cache_age": None,
     }
 
 
@@ -65,4 +71,41 @@ def test_check_result_with_message_to_dict():
         "description": "the_description",
         "success": False,
         "message": "test message",
+        "cache_age": None,
+    }
+
+
+def test_check_result_from_dict():
+    result = CheckResult.from_dict(
+        CheckResult("check_one", "the_description", True, "test message", 1.5).to_dict()
+    )
+
+    assert result.test_id == "check_one"
+    assert result.description == "the_description"
+    assert result.success is True
+    assert result.message == "test message"
+    assert result.cache_age == 1.5
+
+
+def test_check_results_are_immutable():
+    result = CheckResult("check_one", "the_description", True)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.success = False
+
+    assert 1.5 == result.with_cache_age(1.5).cache_age
+    assert result.cache_age is None
+
+
+def test_check_results_round_trip_through_json():
+    results = [
+        CheckResult("check_one", "the_description", True),
+        CheckResult("check_two", "another_description", False, "test message", 1.5),
+    ]
+
+    encoded = dumps({"check_results": results})
+
+    assert orjson.loads(encoded) == {
+        "check_results": [result.to_dict() for result in results]
     }
+    assert results == results_from_json(orjson.loads(encoded)["check_results"])
@@ -1,24 +1,33 @@
+import asyncio
 import base64
 import json
+import threading
 from unittest.mock import Mock
 from unittest.mock import patch
 
 import pytest
 import requests
 from django.contrib.auth.models import User
+from django.db import connections
+from django.test import AsyncRequestFactory
 from django.test import override_settings
 from django.urls import reverse
+from django.utils import timezone
 from freezegun import freeze_time
 
-from app.views import MANDATORY_CHECKS, HttpConnectionCheck
+from app.checks import HttpConnectionCheck
+from app.models import ScheduledTask
+from app.util import CheckResult
+from app.views import MANDATORY_CHECKS
+from app.views import async_index
 
 TOKEN_SESSION_KEY = "auth_token"
 
 
-@patch("app.check.check_http.requests")
-def test_http_view(patched_requests, mock_environment):
+@patch("app.checks.http_session")
+def test_http_view(patched_session, mock_environment):
     mock_environment("HTTP_CHECK_URLS", "https://example.com")
-    patched_requests.get.return_value = Mock(status_code=200)
+    patched_session.return_value.get.return_value = Mock(status_code=200)
     check = HttpConnectionCheck()
     response = check()[0]
     assert "HTTP Checks" == response.description
@@ -38,6 +47,18 @@ def test_api_view(client):
     assert response_data["timestamp"] == "2024-08-01T12:34:56"
 
 
+@override_settings(ROOT_URLCONF="tests.api_urls", FAST_JSON=True)
+@freeze_time("2024-08-01 12:34:56")
+def test_api_view_with_fast_json(client):
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/json"
+    assert (
+        response.content == b'{"message":"Success","timestamp":"2024-08-01T12:34:56"}'
+    )
+
+
 @override_settings(ROOT_URLCONF="tests.api_urls")
 @patch("app.views.reverse")
 @patch("app.views.requests.get")
@@ -222,3 +243,195 @@ def test_index_with_json_query_string_returns_json(client):
         len([res for res in check_results if res["description"] == "Server Time"]) == 1
     )
     assert response.status_code == 200
+
+
+@override_settings(ACTIVE_CHECKS=["read_write"])
+def test_async_index_with_json_query_string_returns_json():
+    request = AsyncRequestFactory().get("/?json=true")
+
+    response = asyncio.run(async_index(request))
+    check_results = json.loads(response.content)["check_results"]
+
+    assert ["git_information", "server_time", "read_write"] == [
+        res["test_id"] for res in check_results
+    ]
+    assert check_results[2]["success"]
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(ACTIVE_CHECKS=["beat"], CHECK_CACHE_TTL=0)
+def test_async_index_closes_the_db_connections_of_sync_checks(mock_environment):
+    mock_environment("RDS_POSTGRES_CREDENTIALS", "{}")
+    ScheduledTask.objects.create(taskid="task-1", timestamp=timezone.now())
+    query_threads, closing_threads = [], []
+    latest = ScheduledTask.objects.latest
+    close_all = connections.close_all
+
+    def recording_latest(*args, **kwargs):
+        query_threads.append(threading.current_thread())
+        return latest(*args, **kwargs)
+
+    def recording_close_all():
+        closing_threads.append(threading.current_thread())
+        close_all()
+
+    request = AsyncRequestFactory().get("/?json=true")
+    with patch.object(ScheduledTask.objects, "latest", recording_latest), patch.object(
+        connections, "close_all", recording_close_all
+    ):
+        response = asyncio.run(async_index(request))
+    check_results = json.loads(response.content)["check_results"]
+
+    assert check_results[2]["success"]
+    assert 1 == len(query_threads)
+    assert query_threads[0] in closing_threads
+
+
+@override_settings(CHECK_SNAPSHOTS=True, ACTIVE_CHECKS=["redis"])
+@patch("app.views.load_snapshot")
+def test_index_reads_optional_checks_from_the_snapshot(mock_load_snapshot, client):
+    mock_load_snapshot.return_value = [
+        CheckResult("redis", "Redis", True, "From the snapshot", 5.0)
+    ]
+
+    response = client.get("/?json=true")
+    check_results = json.loads(response.content)["check_results"]
+
+    assert ["git_information", "server_time", "redis"] == [
+        res["test_id"] for res in check_results
+    ]
+    assert "From the snapshot" == check_results[2]["message"]
+    assert 5.0 == check_results[2]["cache_age"]
+
+
+@override_settings(CHECK_SNAPSHOTS=True, ACTIVE_CHECKS=["celery", "redis"])
+@patch("app.checks.demodjango_task")
+@patch("app.views.load_snapshot")
+def test_index_always_runs_the_celery_worker_check_live(
+    mock_load_snapshot, patched_task, client
+):
+    mock_load_snapshot.return_value = [
+        CheckResult("redis", "Redis", True, "From the snapshot", 5.0)
+    ]
+    patched_task.delay.return_value = Mock(id="task-1", status="SUCCESS")
+
+    response = client.get("/?json=true")
+    check_results = json.loads(response.content)["check_results"]
+
+    assert ["git_information", "server_time", "celery", "redis"] == [
+        res["test_id"] for res in check_results
+    ]
+    assert check_results[2]["success"]
+    patched_task.delay.assert_called_once()
+
+
+@override_settings(CHECK_SNAPSHOTS=True, ACTIVE_CHECKS=["read_write"])
+@patch("app.views.load_snapshot")
+def test_index_runs_live_checks_when_asked(mock_load_snapshot, client):
+    response = client.get("/?json=true&live=true")
+    check_results = json.loads(response.content)["check_results"]
+
+    mock_load_snapshot.assert_not_called()
+    assert ["git_information", "server_time", "read_write"] == [
+        res["test_id"] for res in check_results
+    ]
+
+
+@override_settings(ACTIVE_CHECKS=["read_write", "server_time"])
+def test_index_runs_only_the_requested_checks(client):
+    response = client.get("/?json=true&checks=read_write,server_time")
+    check_results = json.loads(response.content)["check_results"]
+
+    assert ["server_time", "read_write"] == [res["test_id"] for res in check_results]
+
+
+@override_settings(ACTIVE_CHECKS=["read_write", "private_submodule", "redis"])
+def test_index_runs_only_the_checks_with_the_requested_tags(client):
+    response = client.get("/?json=true&tags=local")
+    check_results = json.loads(response.content)["check_results"]
+
+    assert [
+        "git_information",
+        "server_time",
+        "private_submodule",
+        "read_write",
+    ] == [res["test_id"] for res in check_results]
+
+
+@override_settings(CHECK_SNAPSHOTS=True)
+@patch("app.views.load_snapshot")
+def test_index_runs_filtered_requests_live(mock_load_snapshot, client):
+    response = client.get("/?json=true&checks=server_time")
+    check_results = json.loads(response.content)["check_results"]
+
+    mock_load_snapshot.assert_not_called()
+    assert ["server_time"] == [res["test_id"] for res in check_results]
+
+
+@override_settings(ACTIVE_CHECKS=["read_write"])
+def test_index_streams_ndjson(client):
+    response = client.get("/?json=true&stream=true")
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    check_results = [json.loads(line) for line in lines]
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert ["git_information", "read_write", "server_time"] == sorted(
+        res["test_id"] for res in check_results
+    )
+
+
+@override_settings(ACTIVE_CHECKS=["read_write"])
+def test_index_streams_html(client):
+    response = client.get("/?stream=true")
+    content = b"".join(response.streaming_content).decode()
+
+    assert response.status_code == 200
+    assert content.startswith("<!doctype html>")
+    assert content.endswith("</body></html>")
+    assert 'data-testid="filesystem-read-write"' in content
+
+
+@override_settings(ACTIVE_CHECKS=["read_write"])
+def test_async_index_streams_ndjson():
+    request = AsyncRequestFactory().get("/?json=true&stream=true")
+
+    async def consume():
+        response = await async_index(request)
+        return [chunk async for chunk in response.streaming_content]
+
+    lines = b"".join(asyncio.run(consume())).decode().splitlines()
+
+    assert ["git_information", "read_write", "server_time"] == sorted(
+        json.loads(line)["test_id"] for line in lines
+    )
+
+
+def test_healthz_skips_the_other_middleware(client):
+    response = client.get("/healthz")
+
+    assert response.status_code == 200
+    assert json.loads(response.content)["check_results"][0]["success"]
+    # Set by XFrameOptionsMiddleware on every response that goes through it
+    assert "X-Frame-Options" not in response.headers
+    assert not response.cookies
+
+
+@override_settings(ACTIVE_CHECKS=["read_write", "private_submodule"])
+def test_readyz_runs_only_the_critical_checks(client):
+    response = client.get("/readyz")
+    check_results = json.loads(response.content)["check_results"]
+
+    assert response.status_code == 200
+    assert ["read_write"] == [res["test_id"] for res in check_results]
+    assert "X-Frame-Options" not in response.headers
+
+
+@override_settings(ACTIVE_CHECKS=["postgres_rds"])
+def test_readyz_fails_when_a_critical_check_fails(client):
+    response = client.get("/readyz")
+    check_results = json.loads(response.content)["check_results"]
+
+    assert response.status_code == 503
+    assert "No RDS database" == check_results[0]["message"]
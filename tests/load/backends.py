@@ -0,0 +1,143 @@
+import json
+import socket
+import threading
+from contextlib import ExitStack
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import boto3
+import redis
+from fakeredis import TcpFakeServer
+from moto.server import ThreadedMotoServer
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+SAMPLE_FILE = BASE_DIR / "sample_file.txt"
+BUCKETS = ["load-test-bucket", "load-test-additional-bucket"]
+AWS_CREDENTIALS = {
+    "AWS_ACCESS_KEY_ID": "load-test",
+    "AWS_SECRET_ACCESS_KEY": "load-test",
+    "AWS_DEFAULT_REGION": "eu-west-2",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def respond(self, status, body, content_type):
+        body = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubHTTPHandler(QuietHandler):
+    """Stands in for the URLs in HTTP_CHECK_URLS."""
+
+    def do_GET(self):
+        self.respond(200, "OK", "text/plain")
+
+
+class StubOpenSearchHandler(QuietHandler):
+    """Answers the single document read made by OpensearchCheck."""
+
+    def do_GET(self):
+        if self.path.split("?")[0] == "/test-index/_doc/1":
+            document = {
+                "_index": "test-index",
+                "_id": "1",
+                "found": True,
+                "_source": {"text": "Test content read from OpenSearch."},
+            }
+            self.respond(200, json.dumps(document), "application/json")
+        else:
+            self.respond(404, json.dumps({"found": False}), "application/json")
+
+
+@contextmanager
+def http_server(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", free_port()), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def redis_server():
+    server = TcpFakeServer(("127.0.0.1", free_port()), server_type="redis")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    endpoint = f"redis://127.0.0.1:{server.server_address[1]}"
+    try:
+        redis.Redis.from_url(endpoint).set("test-data", "Test content read from Redis")
+        yield endpoint
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def s3_server():
+    port = free_port()
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=port, verbose=False)
+    server.start()
+    endpoint = f"http://127.0.0.1:{port}"
+    try:
+        s3 = boto3.client(
+            "s3",
+            endpoint_url=endpoint,
+            region_name=AWS_CREDENTIALS["AWS_DEFAULT_REGION"],
+            aws_access_key_id=AWS_CREDENTIALS["AWS_ACCESS_KEY_ID"],
+            aws_secret_access_key=AWS_CREDENTIALS["AWS_SECRET_ACCESS_KEY"],
+        )
+        for bucket in BUCKETS:
+            s3.create_bucket(
+                Bucket=bucket,
+                CreateBucketConfiguration={
+                    "LocationConstraint": AWS_CREDENTIALS["AWS_DEFAULT_REGION"]
+                },
+            )
+            s3.upload_file(str(SAMPLE_FILE), bucket, SAMPLE_FILE.name)
+        yield endpoint
+    finally:
+        server.stop()
+
+
+@contextmanager
+def backends():
+    """
+    Start local stand-ins for every backend the checks talk to, yielding the
+    environment variables that point the application at them.
+    """
+    with ExitStack() as stack:
+        redis_endpoint = stack.enter_context(redis_server())
+        s3_endpoint = stack.enter_context(s3_server())
+        http_endpoint = stack.enter_context(http_server(StubHTTPHandler))
+        opensearch_endpoint = stack.enter_context(http_server(StubOpenSearchHandler))
+
+        yield {
+            **AWS_CREDENTIALS,
+            "REDIS_ENDPOINT": redis_endpoint,
+            "AWS_ENDPOINT_URL_S3": s3_endpoint,
+            "S3_BUCKET_NAME": BUCKETS[0],
+            "ADDITIONAL_S3_BUCKET_NAME": BUCKETS[1],
+            "HTTP_CHECK_URLS": f"{http_endpoint}/|200|GET",
+            "OPENSEARCH_ENDPOINT": opensearch_endpoint,
+            "ACTIVE_CHECKS": "http,opensearch,read_write,redis,s3,s3_additional",
+        }
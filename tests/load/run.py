@@ -0,0 +1,239 @@
+"""
+Measure throughput and latency of the web and API services under concurrent load.
+
+Each service is started with gunicorn and pointed at local stand-ins for Redis, S3,
+OpenSearch and the HTTP check URLs, so results only reflect the application itself.
+
+    poetry run python -m tests.load.run --concurrency 16 --requests 500
+    poetry run python -m tests.load.run --compare tests/load/results/<commit>.json
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import ExitStack
+from contextlib import contextmanager
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+
+import aiohttp
+
+from tests.load.backends import BASE_DIR
+from tests.load.backends import backends
+from tests.load.backends import free_port
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+BASIC_AUTH = ("load-test-user", "load-test-password")
+
+# name: (service, path, headers, expected status)
+SCENARIOS = {
+    "index": ("web", "/", {}, 200),
+    "index_json": ("web", "/?json=true", {}, 200),
+    "api": ("api", "/", {}, 200),
+    "ipfilter": ("web", "/ipfilter/", {}, 200),
+    "ipfilter_basic_auth": (
+        "web",
+        "/ipfilter-basic-auth/",
+        {
+            "Authorization": "Basic "
+            + base64.b64encode(":".join(BASIC_AUTH).encode()).decode()
+        },
+        302,
+    ),
+}
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+@contextmanager
+def service(env, workers, threads):
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "demodjango.wsgi",
+            f"--bind=127.0.0.1:{port}",
+            f"--workers={workers}",
+            f"--threads={threads}",
+            "--log-level=warning",
+        ],
+        cwd=BASE_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(wait_until_ready(url, process))
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def wait_until_ready(url, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+            try:
+                async with session.get(f"{url}/healthz") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready within {timeout} seconds")
+
+
+async def load(url, headers, expected_status, requests, concurrency, warmup):
+    latencies, errors = [], 0
+    remaining = requests
+
+    async def worker(session, record):
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                async with session.get(
+                    url, headers=headers, allow_redirects=False
+                ) as response:
+                    await response.read()
+                    ok = response.status == expected_status
+            except aiohttp.ClientError:
+                ok = False
+            if record:
+                latencies.append(time.perf_counter() - start)
+                errors += 0 if ok else 1
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        remaining = warmup
+        await asyncio.gather(*[worker(session, False) for _ in range(concurrency)])
+
+        remaining = requests
+        start = time.perf_counter()
+        await asyncio.gather(*[worker(session, True) for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def print_results(results, previous=None):
+    print(
+        f"{'scenario':<22}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        f"{'errors':>8}"
+    )
+    for name, result in results["scenarios"].items():
+        line = (
+            f"{name:<22}{result['requests_per_second']:>10}{result['p50_ms']:>10}"
+            f"{result['p95_ms']:>10}{result['p99_ms']:>10}{result['errors']:>8}"
+        )
+        before = (previous or {}).get("scenarios", {}).get(name)
+        if before:
+            change = result["requests_per_second"] / before["requests_per_second"] - 1
+            line += f"  {change:+.1%} req/s vs {previous['commit']}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument(
+        "--scenarios", default=",".join(SCENARIOS), help="Comma separated scenarios"
+    )
+    parser.add_argument("--output", help="Defaults to results/<commit>.json")
+    parser.add_argument("--compare", help="Earlier results to compare against")
+    args = parser.parse_args()
+
+    scenarios = {name: SCENARIOS[name] for name in args.scenarios.split(",")}
+    commit = git_commit()
+
+    with ExitStack() as stack:
+        backend_env = stack.enter_context(backends())
+        env = {
+            **os.environ,
+            **backend_env,
+            "DJANGO_SECRET_KEY": "load-test",
+            "BASIC_AUTH_USERNAME": BASIC_AUTH[0],
+            "BASIC_AUTH_PASSWORD": BASIC_AUTH[1],
+            "DD_TRACE_ENABLED": "false",
+        }
+        urls = {
+            "web": stack.enter_context(service(env, args.workers, args.threads)),
+            "api": stack.enter_context(
+                service({**env, "IS_API": "True"}, args.workers, args.threads)
+            ),
+        }
+
+        results = {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "threads": args.threads,
+            "scenarios": {},
+        }
+        for name, (service_name, path, headers, expected_status) in scenarios.items():
+            results["scenarios"][name] = asyncio.run(
+                load(
+                    f"{urls[service_name]}{path}",
+                    headers,
+                    expected_status,
+                    args.requests,
+                    args.concurrency,
+                    args.warmup,
+                )
+            )
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+    print_results(results, previous)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()